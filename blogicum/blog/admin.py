@@ -1,32 +1,136 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 
-from .models import Category, Comments, Location, Post
+from . import feed, page_cache, pagination, search, tasks, utils
+from .models import Category, Comments, Job, Location, Post
+from .pagination import CachedCountPaginator
 
 admin.site.empty_value_display = 'Не задано'
 
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 1
+class CachedCountAdminMixin:
+    # Без фильтров количество строк оценивается по наибольшему ключу,
+    # с фильтрами считается один раз на набор фильтров и хранится до
+    # изменения объектов этой модели; общее число строк не считается.
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        params = sorted(
+            (key, value) for key, value in request.GET.items()
+            if key not in (PAGE_VAR, ORDER_VAR)
+        )
+        return CachedCountPaginator(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_key=f'admin:{self.model._meta.label}:{params}',
+            estimate=not params,
+        )
+
+
+class AuthorFilter(admin.SimpleListFilter):
+    # Вместо списка всех пользователей — поле для ввода имени автора.
+    title = 'автору'
+    parameter_name = 'author'
+    template = 'admin/blog/author_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value())
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'value': self.value() or '',
+            'parameter_name': self.parameter_name,
+            'hidden_params': [
+                (key, value) for key, value in changelist.params.items()
+                if key not in (self.parameter_name, PAGE_VAR)
+            ],
+            'reset_url': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class RelatedPostsMixin:
+    # Вместо встроенных форм всех публикаций — постраничная таблица
+    # со ссылками и массовой публикацией/снятием с публикации.
+    change_form_template = 'admin/blog/related_posts_change_form.html'
+    related_posts_field = None
+    related_posts_per_page = 20
+
+    def get_related_posts_context(self, request, obj):
+        lookup = {f'{self.related_posts_field}__id__exact': obj.pk}
+        posts = Post.objects.filter(**lookup).select_related(
+            'author'
+        ).only(
+            'id', 'title', 'is_published', 'pub_date', 'author__username'
+        ).order_by('-id')
+        paginator = CachedCountPaginator(
+            posts,
+            self.related_posts_per_page,
+            count_key=f'admin-related:{self.related_posts_field}:{obj.pk}'
+        )
+        page = paginator.get_page(request.GET.get('posts_page'))
+        changelist_url = reverse('admin:blog_post_changelist')
+        return {
+            'related_posts': page,
+            'related_posts_window': paginator.get_page_window(page.number),
+            'related_posts_url': '{}?{}={}'.format(
+                changelist_url, *lookup, obj.pk
+            ),
+        }
+
+    # вызывается, когда админка уже загрузила объект и проверила,
+    # что он существует
+    def render_change_form(self, request, context, add=False, change=False,
+                           form_url='', obj=None):
+        if change and obj is not None:
+            context.update(self.get_related_posts_context(request, obj))
+        return super().render_change_form(
+            request, context, add, change, form_url, obj
+        )
 
 
 @admin.register(Comments)
-class CommentsAdmin(admin.ModelAdmin):
+class CommentsAdmin(CachedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'text',
         'created_at',
         'post',
         'author',
     )
-    search_fields = (
+    list_select_related = (
         'post',
         'author',
+    )
+    search_fields = (
+        'post__title',
+        'author__username',
         'text',
     )
+    autocomplete_fields = (
+        'post',
+        'author',
+    )
+    ordering = ('-id',)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(RelatedPostsMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'description',
@@ -39,11 +143,11 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = (
         'title',
     )
-    inlines = (PostInline,)
+    related_posts_field = 'category'
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(CachedCountAdminMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'title',
@@ -53,8 +157,18 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'pub_date',
     )
+    list_select_related = (
+        'author',
+        'location',
+        'category',
+    )
+    # категория и местоположение в списке не редактируются: каждая
+    # строка загружала бы все варианты выбора заново
     list_editable = (
         'is_published',
+    )
+    autocomplete_fields = (
+        'author',
         'category',
         'location',
     )
@@ -64,15 +178,59 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_filter = (
         'is_published',
-        'author',
+        AuthorFilter,
         'pub_date',
     )
     list_per_page = 30
     list_display_links = ('title',)
+    ordering = ('-id',)
+    actions = (
+        'publish_posts',
+        'unpublish_posts',
+    )
+
+    # update() не вызывает сигналы, поэтому лента, её отложенное
+    # обновление, версия карточек, кэш страниц и количества
+    # обновляются здесь
+    def set_published(self, request, queryset, is_published):
+        posts = Post.objects.filter(
+            pk__in=list(queryset.values_list('pk', flat=True))
+        )
+        updated = posts.update(
+            is_published=is_published,
+            updated_at=timezone.now()
+        )
+        feed.refresh_feed(posts)
+        if is_published:
+            # отложенные публикации попадут в ленту при наступлении даты
+            tasks.schedule_feed_refresh()
+        page_cache.purge_post_pages(posts)
+        pagination.reset_counts(Post)
+        utils.bump_content_version()
+        self.message_user(request, f'Изменено публикаций: {updated}.')
+        next_url = request.POST.get('next')
+        if next_url and url_has_allowed_host_and_scheme(
+            next_url, allowed_hosts={request.get_host()}
+        ):
+            return HttpResponseRedirect(next_url)
+        return None
+
+    @admin.action(description='Опубликовать выбранные публикации')
+    def publish_posts(self, request, queryset):
+        return self.set_published(request, queryset, True)
+
+    @admin.action(description='Снять выбранные публикации с публикации')
+    def unpublish_posts(self, request, queryset):
+        return self.set_published(request, queryset, False)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search.filter_posts(queryset, search_term), False
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(RelatedPostsMixin, admin.ModelAdmin):
     list_display = (
         'name',
         'created_at',
@@ -80,4 +238,22 @@ class LocationAdmin(admin.ModelAdmin):
     search_fields = (
         'name',
     )
-    inlines = (PostInline,)
+    related_posts_field = 'location'
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'key',
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    search_fields = (
+        'key',
+    )
@@ -0,0 +1,39 @@
+from django.db.models import F
+
+from .models import FeedEntry, Post
+
+
+def visible_posts():
+    return Post.published.filter(category__is_published=True)
+
+
+def sync_post(post):
+    if visible_posts().filter(pk=post.pk).exists():
+        FeedEntry.objects.update_or_create(
+            post_id=post.pk, defaults={'pub_date': post.pub_date}
+        )
+    else:
+        FeedEntry.objects.filter(post_id=post.pk).delete()
+
+
+# Приводит ленту в соответствие с видимыми публикациями: удаляет
+# скрытые, обновляет даты и добавляет наступившие отложенные публикации.
+def refresh_feed(posts=None):
+    posts = Post.objects.all() if posts is None else posts
+    entries = FeedEntry.objects.filter(post__in=posts)
+    visible = visible_posts().filter(pk__in=posts.values('pk'))
+
+    removed, _ = entries.exclude(post__in=visible.values('pk')).delete()
+    for pk, pub_date in visible.filter(
+        feed_entry__isnull=False
+    ).exclude(
+        feed_entry__pub_date=F('pub_date')
+    ).values_list('pk', 'pub_date'):
+        FeedEntry.objects.filter(post_id=pk).update(pub_date=pub_date)
+    added = FeedEntry.objects.bulk_create(
+        FeedEntry(post_id=pk, pub_date=pub_date)
+        for pk, pub_date in visible.filter(
+            feed_entry__isnull=True
+        ).values_list('pk', 'pub_date')
+    )
+    return len(added), removed
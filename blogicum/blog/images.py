@@ -0,0 +1,73 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import Post
+from .utils import bump_content_version
+
+VARIANTS_DIR = 'posts_images/variants'
+
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', 'webp'),
+    ('jpeg', 'JPEG', 'jpg'),
+)
+
+
+def variants_are_stale(post):
+    original = post.image_variants.get('original', {})
+    return post.image.name != original.get('name', '')
+
+
+def remove_image_variants(variants):
+    for name, variant in variants.items():
+        if name == 'original':
+            continue
+        for key, _, _ in VARIANT_FORMATS:
+            if variant.get(key):
+                default_storage.delete(variant[key])
+
+
+def render_variant(image, fmt):
+    buffer = BytesIO()
+    image.save(buffer, fmt, quality=settings.POST_IMAGE_QUALITY)
+    return ContentFile(buffer.getvalue())
+
+
+def build_image_variants(post):
+    remove_image_variants(post.image_variants)
+    variants = {}
+    if post.image:
+        stem = PurePosixPath(post.image.name).stem
+        by_width = {}
+        with post.image.open('rb') as file, Image.open(file) as source:
+            source = ImageOps.exif_transpose(source).convert('RGB')
+            for name, max_width in settings.POST_IMAGE_VARIANTS.items():
+                image = source.copy()
+                image.thumbnail((max_width, image.height))
+                if image.width in by_width:
+                    variants[name] = by_width[image.width]
+                    continue
+                variant = {'width': image.width, 'height': image.height}
+                for key, fmt, extension in VARIANT_FORMATS:
+                    variant[key] = default_storage.save(
+                        f'{VARIANTS_DIR}/{post.pk}/{stem}-{name}.{extension}',
+                        render_variant(image, fmt)
+                    )
+                variants[name] = by_width[image.width] = variant
+        variants['original'] = {
+            'name': post.image.name,
+            'width': source.width,
+            'height': source.height,
+        }
+    post.image_variants = variants
+    Post.objects.filter(pk=post.pk).update(
+        image_variants=variants,
+        updated_at=timezone.now()
+    )
+    bump_content_version()
+    return variants
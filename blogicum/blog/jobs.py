@@ -0,0 +1,107 @@
+import logging
+import traceback
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+# Задачи с одинаковым ключом не дублируются: пока задача ждёт
+# выполнения, повторная постановка лишь обновляет параметры и
+# переносит запуск на более ранний срок.
+def enqueue(name, key=None, run_at=None, **payload):
+    if name not in TASKS:
+        raise ValueError(f'Неизвестная задача: {name}')
+    key = key or f'{name}:{uuid4().hex}'
+    run_at = run_at or timezone.now()
+    with transaction.atomic():
+        job, created = Job.objects.select_for_update().get_or_create(
+            key=key,
+            defaults={'name': name, 'payload': payload, 'run_after': run_at}
+        )
+        if not created:
+            if job.status == Job.PENDING:
+                job.run_after = min(job.run_after, run_at)
+            else:
+                job.status = Job.PENDING
+                job.attempts = 0
+                job.run_after = run_at
+            job.name = name
+            job.payload = payload
+            job.save()
+    return job
+
+
+def claim_next(now):
+    # истёкшая аренда означает, что воркер упал на задаче; если попытки
+    # исчерпаны, задача больше не запускается, чтобы не ронять воркеры
+    Job.objects.filter(
+        status=Job.RUNNING,
+        run_after__lte=now,
+        attempts__gte=settings.JOBS_MAX_ATTEMPTS
+    ).update(
+        status=Job.FAILED,
+        last_error='Воркер не завершил задачу за JOBS_LEASE секунд.'
+    )
+    candidates = Job.objects.filter(
+        status__in=(Job.PENDING, Job.RUNNING), run_after__lte=now
+    ).values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        claimed = Job.objects.filter(
+            pk=pk,
+            status__in=(Job.PENDING, Job.RUNNING),
+            run_after__lte=now
+        ).update(
+            status=Job.RUNNING,
+            run_after=now + timedelta(seconds=settings.JOBS_LEASE),
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    try:
+        TASKS[job.name](**job.payload)
+    except Exception:
+        logger.exception('Задача %s завершилась с ошибкой', job.key)
+        failed = job.attempts >= settings.JOBS_MAX_ATTEMPTS
+        delay = settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+        Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(
+            status=Job.FAILED if failed else Job.PENDING,
+            run_after=timezone.now() + timedelta(seconds=delay),
+            last_error=traceback.format_exc()
+        )
+        return False
+    # если задачу успели поставить заново, она уже в статусе PENDING
+    # и будет выполнена ещё раз
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING).delete()
+    return True
+
+
+def run_pending(limit=None):
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next(timezone.now())
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
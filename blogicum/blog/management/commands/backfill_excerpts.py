@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post, make_excerpt
+from blog.utils import bump_content_version
+
+
+class Command(BaseCommand):
+    help = 'Заполняет сохранённые анонсы публикаций по их текстам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Сколько публикаций обновлять за один запрос.'
+        )
+
+    def handle(self, *args, batch_size=500, **options):
+        changed = []
+        updated = 0
+        for post in Post.objects.only('id', 'text', 'excerpt').iterator(
+            chunk_size=batch_size
+        ):
+            excerpt = make_excerpt(post.text)
+            if post.excerpt == excerpt:
+                continue
+            post.excerpt = excerpt
+            post.updated_at = timezone.now()
+            changed.append(post)
+            if len(changed) >= batch_size:
+                updated += self.save_batch(changed)
+        updated += self.save_batch(changed)
+        if updated:
+            bump_content_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено анонсов: {updated}.')
+        )
+
+    def save_batch(self, posts):
+        Post.objects.bulk_update(posts, ['excerpt', 'updated_at'])
+        count = len(posts)
+        posts.clear()
+        return count
@@ -0,0 +1,154 @@
+import asyncio
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.utils import timezone
+
+from blog.feed import refresh_feed
+from blog.models import Category, Post
+from blogicum.sqlite_pool.base import get_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает число запросов к ленте в секунду через ASGI-обработчик '
+        'с новым соединением SQLite на каждый запрос и с пулом соединений. '
+        'Работает на временной копии схемы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--pool-size', type=int, default=8)
+
+    @staticmethod
+    def drop_connection():
+        connections['default'].close()
+        try:
+            del connections['default']
+        except AttributeError:
+            pass
+
+    def use_database(self, database):
+        self.drop_connection()
+        connections.databases['default'] = database
+
+    def seed(self):
+        user = get_user_model().objects.create_user('bench')
+        category = Category.objects.create(
+            title='Нагрузка', slug='bench', description='', is_published=True
+        )
+        pub_date = timezone.now() - timedelta(days=1)
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {number}', text='Текст', author=user,
+                category=category, pub_date=pub_date, is_published=True
+            )
+            for number in range(30)
+        )
+        refresh_feed()
+        # с сессией запрос минует кэш страниц и доходит до базы
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    async def load(self, session, seconds, concurrency):
+        # соединения Django живут в потоке: убираем оставшееся от прошлого
+        # замера в потоке, где ASGI выполняет синхронный код
+        await sync_to_async(self.drop_connection)()
+        handler = ASGIHandler()
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': '/',
+            'root_path': '',
+            'query_string': b'',
+            'headers': [
+                (b'host', settings.ALLOWED_HOSTS[0].encode()),
+                (b'cookie', (
+                    f'{settings.SESSION_COOKIE_NAME}={session}'
+                ).encode()),
+            ],
+            'server': (settings.ALLOWED_HOSTS[0], 80),
+        }
+        stats = {'requests': 0, 'errors': 0, 'opened': 0}
+
+        def count_opened(sender, connection, **kwargs):
+            if not getattr(connection, 'from_pool', False):
+                stats['opened'] += 1
+
+        connection_created.connect(count_opened, weak=False)
+        deadline = time.monotonic() + seconds
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def client():
+            while time.monotonic() < deadline:
+                statuses = []
+
+                async def send(message):
+                    if message['type'] == 'http.response.start':
+                        statuses.append(message['status'])
+
+                await handler(dict(scope), receive, send)
+                if statuses == [200]:
+                    stats['requests'] += 1
+                else:
+                    stats['errors'] += 1
+
+        try:
+            await asyncio.gather(*(client() for _ in range(concurrency)))
+        finally:
+            connection_created.disconnect(count_opened)
+        return stats
+
+    def handle(self, *args, seconds, concurrency, pool_size, **options):
+        original = connections.databases['default']
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                base = {
+                    **original,
+                    'NAME': str(Path(directory) / 'bench.sqlite3'),
+                    'CONN_MAX_AGE': 0,
+                }
+                self.use_database(base)
+                call_command('migrate', verbosity=0)
+                session = self.seed()
+                pooled = {
+                    **base,
+                    'ENGINE': 'blogicum.sqlite_pool',
+                    'POOL_SIZE': pool_size,
+                }
+                modes = (
+                    ('без пула', base),
+                    (f'пул на {pool_size}', pooled),
+                )
+                for title, database in modes:
+                    self.use_database(database)
+                    stats = asyncio.run(
+                        self.load(session, seconds, concurrency)
+                    )
+                    self.stdout.write(
+                        f'{title}: {stats["requests"] / seconds:.1f} '
+                        f'запросов/с, открыто соединений {stats["opened"]}, '
+                        f'ошибок {stats["errors"]}.'
+                    )
+                self.use_database(base)
+                get_pool(pooled).close()
+        finally:
+            self.use_database(original)
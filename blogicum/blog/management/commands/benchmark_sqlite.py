@@ -0,0 +1,121 @@
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from django.utils import timezone
+
+from blog.models import Category, Post
+
+# настройки SQLite по умолчанию, с которыми сравниваем; busy_timeout
+# не трогаем: Django уже ждёт блокировку 5 секунд (OPTIONS['timeout'])
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает страницы блога параллельными чтениями и комментариями '
+        'на временной копии схемы и сравнивает пропускную способность '
+        'SQLite с настройками по умолчанию и с SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+
+    def use_database(self, path, pragmas):
+        connections.close_all()
+        connections.databases['default']['NAME'] = path
+        settings.SQLITE_PRAGMAS = pragmas
+
+    def seed(self):
+        users = [
+            get_user_model().objects.create_user(f'bench{number}')
+            for number in range(8)
+        ]
+        category = Category.objects.create(
+            title='Нагрузка', slug='bench', description='', is_published=True
+        )
+        post = Post.objects.create(
+            title='Нагрузка', text='Текст', author=users[0],
+            category=category, pub_date=timezone.now() - timedelta(days=1),
+            is_published=True
+        )
+        return users, post
+
+    def run_clients(self, users, post, seconds, readers, writers):
+        stats = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        detail = f'/posts/{post.pk}/'
+        comment = f'/posts/{post.pk}/comment/'
+        # сессии создаются до начала замера, чтобы входы не мешали нагрузке
+        clients = []
+        for number, write in enumerate([False] * readers + [True] * writers):
+            client = Client(
+                HTTP_HOST=settings.ALLOWED_HOSTS[0],
+                raise_request_exception=False
+            )
+            client.force_login(users[number % len(users)])
+            clients.append((client, write))
+        deadline = time.monotonic() + seconds
+
+        def worker(client, write):
+            while time.monotonic() < deadline:
+                if write:
+                    response = client.post(comment, {'text': 'Нагрузка'})
+                    ok = response.status_code == 302
+                else:
+                    ok = client.get(detail).status_code == 200
+                with lock:
+                    if not ok:
+                        stats['errors'] += 1
+                    elif write:
+                        stats['writes'] += 1
+                    else:
+                        stats['reads'] += 1
+            connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=args) for args in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
+
+    def handle(self, *args, seconds, readers, writers, **options):
+        original_name = connections.databases['default']['NAME']
+        original_pragmas = settings.SQLITE_PRAGMAS
+        modes = (
+            ('по умолчанию', DEFAULT_PRAGMAS),
+            ('SQLITE_PRAGMAS', original_pragmas),
+        )
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for number, (title, pragmas) in enumerate(modes):
+                    path = str(Path(directory) / f'mode-{number}.sqlite3')
+                    self.use_database(path, pragmas)
+                    call_command('migrate', verbosity=0)
+                    users, post = self.seed()
+                    stats = self.run_clients(
+                        users, post, seconds, readers, writers
+                    )
+                    self.stdout.write(
+                        f'{title}: чтений {stats["reads"] / seconds:.1f}/с, '
+                        f'записей {stats["writes"] / seconds:.1f}/с, '
+                        f'ошибок {stats["errors"]}.'
+                    )
+        finally:
+            self.use_database(original_name, original_pragmas)
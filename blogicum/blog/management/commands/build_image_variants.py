@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import build_image_variants, variants_are_stale
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии фото публикаций, у которых их нет, '
+        'и сохраняет размеры исходных фото.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии для всех публикаций с фото.'
+        )
+
+    def handle(self, *args, force=False, **options):
+        built = 0
+        posts = Post.objects.exclude(image='').only(
+            'id', 'image', 'image_variants'
+        )
+        for post in posts.iterator():
+            if force or variants_are_stale(post):
+                build_image_variants(post)
+                built += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано фото: {built}.')
+        )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from blog.models import Post
+from blog.utils import actual_comment_count, bump_content_version
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые счётчики комментариев публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, ничего не изменяя.'
+        )
+
+    def handle(self, *args, check=False, **options):
+        stale = Post.objects.annotate(
+            actual_count=actual_comment_count()
+        ).exclude(comment_count=F('actual_count'))
+        if check:
+            stale_count = stale.count()
+            if stale_count:
+                raise CommandError(
+                    f'Счётчики комментариев расходятся у {stale_count} '
+                    'публикаций.'
+                )
+            self.stdout.write('Счётчики комментариев в порядке.')
+            return
+        updated = Post.objects.update(comment_count=actual_comment_count())
+        bump_content_version()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}.')
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import refresh_feed
+from blog.models import Post
+from blog.page_cache import purge_recently_published
+from blog.pagination import reset_counts
+from blog.utils import bump_content_version
+
+
+class Command(BaseCommand):
+    help = (
+        'Синхронизирует ленту главной страницы с видимыми публикациями '
+        'и добавляет в неё наступившие отложенные публикации. '
+        'Рассчитана на периодический запуск, например из cron раз в минуту.'
+    )
+
+    def handle(self, *args, **options):
+        added, removed = refresh_feed()
+        purge_recently_published()
+        reset_counts(Post)
+        bump_content_version()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Добавлено записей: {added}, удалено: {removed}.'
+            )
+        )
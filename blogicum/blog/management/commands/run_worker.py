@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blog.jobs import run_pending
+from blog.tasks import schedule_feed_refresh
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах между опросами пустой очереди.'
+        )
+
+    def handle(self, *args, once=False, interval=1.0, **options):
+        schedule_feed_refresh()
+        while True:
+            close_old_connections()
+            processed = run_pending()
+            if processed:
+                self.stdout.write(f'Выполнено задач: {processed}.')
+            if once:
+                return
+            if not processed:
+                time.sleep(interval)
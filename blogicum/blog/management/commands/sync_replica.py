@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.routers import replica_configured, sync_replica
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файл реплики '
+        '(BLOGICUM_REPLICA_DB). Нужна для локальной проверки чтения '
+        'из реплики, где нет настоящей репликации.'
+    )
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError(
+                'Реплика не настроена: задайте BLOGICUM_REPLICA_DB.'
+            )
+        sync_replica()
+        self.stdout.write(self.style.SUCCESS('Реплика обновлена.'))
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_feed(apps, schema_editor):
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry.objects.bulk_create(
+        FeedEntry(post_id=pk, pub_date=pub_date)
+        for pk, pub_date in Post.objects.filter(
+            is_published=True,
+            pub_date__lte=timezone.now(),
+            category__is_published=True,
+        ).values_list('pk', 'pub_date')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date', '-post'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='blog_feed_order_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
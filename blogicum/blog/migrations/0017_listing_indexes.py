@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_feedentry'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='feedentry',
+            options={'ordering': ('-pub_date', '-post_id'), 'verbose_name': 'запись ленты', 'verbose_name_plural': 'Лента'},
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['post', 'created_at', 'id'], name='blog_comments_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['pub_date', 'id'], name='blog_post_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', 'pub_date', 'id'], name='blog_post_category_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'pub_date', 'id'], name='blog_post_author_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=timezone.now, verbose_name='Изменено'),
+            preserve_default=False,
+        ),
+    ]
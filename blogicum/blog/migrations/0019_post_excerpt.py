@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = list(Post.objects.only('id', 'text'))
+    for post in posts:
+        post.excerpt = Truncator(post.text).words(
+            settings.POST_EXCERPT_WORDS, truncate=' …'
+        )
+    Post.objects.bulk_update(posts, ['excerpt'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
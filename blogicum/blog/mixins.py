@@ -1,17 +1,93 @@
+from hashlib import md5
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import Http404
+from django.middleware.csrf import get_token
+from django.views.decorators.http import condition
+
+from .pagination import CursorPaginator, InvalidCursor
+
+
+class CachedObjectMixin:
+    # Представление создаётся на каждый запрос, поэтому объект,
+    # запомненный на экземпляре, загружается из базы один раз за запрос:
+    # и для проверки прав, и для UpdateView/DeleteView.
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_cached_object'):
+            self._cached_object = super().get_object()
+        return self._cached_object
 
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+class OnlyAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
     def test_func(self):
+        if not self.request.user.is_authenticated:
+            return False
         object = self.get_object()
-        if hasattr(object, 'username'):
-            return object.username == self.request.user.username
-        elif hasattr(object, 'author'):
-            return object.author.username == self.request.user.username
+        if isinstance(object, get_user_model()):
+            return object.pk == self.request.user.pk
+        return object.author_id == self.request.user.pk
 
 
 class UserMixin:
     model = get_user_model()
     slug_url_kwarg = 'username'
     slug_field = 'username'
+
+
+class CursorPaginationMixin:
+    cursor_ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.get_page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы.')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class ConditionalGetMixin:
+    # Валидаторы считаются до основных запросов страницы; если она
+    # не менялась, шаблон не рендерится и клиент получает 304.
+    # Страницы с формами для вошедших пользователей учитывают сессию
+    # и CSRF-токен: после нового входа в браузере не должна остаться
+    # страница со старым токеном.
+    etag_includes_csrf = False
+
+    def get_etag_parts(self):
+        return ()
+
+    def get_last_modified(self):
+        return None
+
+    def get_etag(self):
+        user = self.request.user
+        parts = [
+            self.request.get_full_path(),
+            user.pk if user.is_authenticated else '',
+            *self.get_etag_parts(),
+        ]
+        if self.etag_includes_csrf and user.is_authenticated:
+            # get_token маскирует токен заново при каждом вызове,
+            # стабильно только значение cookie
+            get_token(self.request)
+            parts += [
+                self.request.session.session_key,
+                self.request.META['CSRF_COOKIE'],
+            ]
+        return md5('|'.join(map(str, parts)).encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        view = condition(
+            etag_func=lambda request, *args, **kwargs: self.get_etag(),
+            last_modified_func=(
+                lambda request, *args, **kwargs: self.get_last_modified()
+            ),
+        )(super().get)
+        return view(request, *args, **kwargs)
@@ -1,19 +1,56 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils import timezone
-
-from blogicum import settings
+from django.utils.text import Truncator
 
 User = get_user_model()
 
 
+def floor_publication_time(moment):
+    granularity = settings.PUBLISH_GRANULARITY
+    if granularity <= 1:
+        return moment
+    seconds = moment.timestamp() // granularity * granularity
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def ceil_publication_time(moment):
+    floored = floor_publication_time(moment)
+    if floored == moment:
+        return moment
+    return floored + timedelta(seconds=settings.PUBLISH_GRANULARITY)
+
+
+def make_excerpt(text):
+    return Truncator(text).words(settings.POST_EXCERPT_WORDS, truncate=' …')
+
+
 class PublishedManager(models.Manager):
+    # «Сейчас» округляется вниз до PUBLISH_GRANULARITY секунд, поэтому
+    # в пределах одного интервала SQL опубликованных выборок не меняется
+    # и их можно кешировать.
+    @staticmethod
+    def now():
+        return floor_publication_time(timezone.now())
+
     def get_queryset(self):
         return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
+            pub_date__lte=self.now(),
             is_published=True
         )
 
+    def next_publication(self):
+        pub_date = super().get_queryset().filter(
+            pub_date__gt=self.now(),
+            is_published=True
+        ).aggregate(models.Min('pub_date'))['pub_date__min']
+        if pub_date is None:
+            return None
+        return ceil_publication_time(pub_date)
+
     class Meta:
         abstract = True
 
@@ -39,6 +76,11 @@ class Post(PublishedCreatedModel):
         verbose_name='Заголовок'
     )
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Анонс'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -68,6 +110,26 @@ class Post(PublishedCreatedModel):
         null=True
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    # размеры исходного фото и его уменьшенные копии:
+    # {'original': {'name', 'width', 'height'},
+    #  'card': {'width', 'height', 'webp', 'jpeg'}, ...}
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Варианты фото'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    # версия всего, что выводится о публикации: обновляется при изменении
+    # поста, его категории, местоположения, автора и комментариев
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
 
     objects = models.Manager()
     published = PublishedManager()
@@ -76,10 +138,33 @@ class Post(PublishedCreatedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['pub_date', 'id'],
+                condition=models.Q(is_published=True),
+                name='blog_post_published_idx'
+            ),
+            models.Index(
+                fields=['category', 'pub_date', 'id'],
+                condition=models.Q(is_published=True),
+                name='blog_post_category_feed_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='blog_post_author_feed_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
 
 class Category(PublishedCreatedModel):
     title = models.CharField(
@@ -142,3 +227,94 @@ class Comments(models.Model):
         ordering = ('-created_at',)
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at', 'id'],
+                name='blog_comments_thread_idx'
+            ),
+        ]
+
+
+class FeedEntry(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        ordering = ('-pub_date', '-post_id')
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-post'],
+                name='blog_feed_order_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.pub_date:%Y-%m-%d %H:%M} #{self.post_id}'
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=settings.CHAR_MAX_LENGTH,
+        verbose_name='Задача'
+    )
+    key = models.CharField(
+        max_length=settings.CHAR_MAX_LENGTH,
+        unique=True,
+        verbose_name='Ключ',
+        help_text='Задача с тем же ключом не ставится в очередь повторно.'
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Параметры'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Не раньше'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after',)
+        indexes = [
+            models.Index(
+                fields=['status', 'run_after'],
+                name='blog_job_queue_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,110 @@
+import time
+from datetime import timedelta
+from hashlib import md5
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import Resolver404, resolve, reverse
+from django.utils.cache import get_conditional_response
+
+from .models import Post
+
+FEED_PATH = '/'
+
+
+# Версия хранится для пути целиком, поэтому сброс одного ключа
+# убирает из кэша и все варианты страницы с параметрами запроса.
+def path_version(path):
+    version_key = f'page-version:{path}'
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    return version
+
+
+# Интервал Post.published.now() входит в ключ: наступившие отложенные
+# публикации появляются в списках без сброса из другого процесса.
+def page_cache_key(request):
+    query = md5(request.META.get('QUERY_STRING', '').encode()).hexdigest()
+    bucket = int(Post.published.now().timestamp())
+    return (
+        f'page:{request.path}:{path_version(request.path)}:'
+        f'{bucket}:{query}'
+    )
+
+
+# Ключ строится по request.path, где путь уже раскодирован, а reverse()
+# кодирует не-ASCII символы (например, кириллицу в имени автора).
+def page_path(viewname, *args):
+    return unquote(reverse(viewname, args=args))
+
+
+# Версии сбрасываются после фиксации транзакции: иначе параллельный
+# запрос, прочитавший старые строки, закэширует их под новой версией.
+def purge_pages(paths):
+    keys = [f'page-version:{path}' for path in set(paths)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def post_page_paths(posts):
+    paths = {FEED_PATH}
+    rows = posts.values_list('id', 'category__slug', 'author__username')
+    for post_id, category_slug, username in rows:
+        paths.add(page_path('blog:post_detail', post_id))
+        paths.add(page_path('blog:profile', username))
+        if category_slug:
+            paths.add(page_path('blog:category_posts', category_slug))
+    return paths
+
+
+def purge_post_pages(posts, *extra_paths):
+    purge_pages(post_page_paths(posts) | set(extra_paths))
+
+
+def purge_post(post_id):
+    purge_post_pages(Post.objects.filter(pk=post_id))
+
+
+# Отложенные публикации появляются в лентах без записи в базу;
+# страницы старше PAGE_CACHE_TIMEOUT и так уже вытеснены из кэша.
+def purge_recently_published():
+    since = Post.published.now() - timedelta(
+        seconds=settings.PAGE_CACHE_TIMEOUT
+    )
+    purge_post_pages(Post.published.filter(pub_date__gte=since))
+
+
+class AnonymousPageCacheMiddleware:
+    # Стоит перед сессиями и аутентификацией: анонимный запрос, попавший
+    # в кэш, обходится без них и без рендеринга шаблонов.
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def is_cacheable_request(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.view_name in settings.PAGE_CACHE_URL_NAMES
+
+    def __call__(self, request):
+        if not self.is_cacheable_request(request):
+            return self.get_response(request)
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return get_conditional_response(
+                request, etag=response.get('ETag'), response=response
+            )
+        response = self.get_response(request)
+        if (request.method == 'GET' and response.status_code == 200
+                and not response.cookies and not response.streaming):
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,204 @@
+import base64
+import json
+import time
+from functools import reduce
+from hashlib import md5
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+COUNT_VERSION_KEY = 'paginator-count-version'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw.decode())
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(token)
+    if not isinstance(values, list):
+        raise InvalidCursor(token)
+    return values
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor, previous_cursor, paginator):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.paginator = paginator
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+# Keyset-пагинация: страница выбирается по ключам сортировки крайнего
+# показанного объекта, а не через OFFSET, и общее число объектов
+# не считается, поэтому глубокие страницы стоят столько же, сколько первая.
+class CursorPaginator:
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.keys = [
+            (name.lstrip('-'), name.startswith('-')) for name in self.ordering
+        ]
+        self.fields = [
+            queryset.model._meta.get_field(name) for name, _ in self.keys
+        ]
+
+    def cursor_for(self, obj):
+        return encode_cursor(
+            getattr(obj, field.attname) for field in self.fields
+        )
+
+    def _parse(self, token):
+        values = decode_cursor(token)
+        if len(values) != len(self.fields):
+            raise InvalidCursor(token)
+        try:
+            return [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except ValidationError:
+            raise InvalidCursor(token)
+
+    def _seek(self, values, forward):
+        conditions = []
+        for i, (name, descending) in enumerate(self.keys):
+            lookup = 'lt' if descending == forward else 'gt'
+            equal = {key: value for (key, _), value in
+                     zip(self.keys[:i], values[:i])}
+            conditions.append(
+                Q(**equal, **{f'{name}__{lookup}': values[i]})
+            )
+        return reduce(or_, conditions)
+
+    def _reversed_ordering(self):
+        return [
+            name if descending else f'-{name}'
+            for name, descending in self.keys
+        ]
+
+    def _page(self, rows, has_next, has_previous):
+        return CursorPage(
+            rows,
+            self.cursor_for(rows[-1]) if rows and has_next else None,
+            self.cursor_for(rows[0]) if rows and has_previous else None,
+            self,
+        )
+
+    def get_page(self, after=None, before=None):
+        queryset = self.queryset
+        if before:
+            values = self._parse(before)
+            rows = list(
+                queryset.filter(self._seek(values, forward=False))
+                .order_by(*self._reversed_ordering())[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            rows.reverse()
+            return self._page(rows, True, has_previous)
+
+        if after:
+            queryset = queryset.filter(
+                self._seek(self._parse(after), forward=True)
+            )
+        rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return self._page(rows[:self.per_page], has_next, bool(after))
+
+
+def count_version(model):
+    version_key = f'{COUNT_VERSION_KEY}:{model._meta.label}'
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    return version
+
+
+# Сбрасывает сохранённые количества постраничных списков объектов model
+# после фиксации транзакции, чтобы откаченная запись ничего не сбрасывала;
+# списки других моделей сохраняют свои количества.
+def reset_counts(model):
+    version_key = f'{COUNT_VERSION_KEY}:{model._meta.label}'
+    transaction.on_commit(lambda: cache.delete(version_key))
+
+
+# Оценка по наибольшему первичному ключу: поиск по индексу вместо
+# COUNT(*) по всей таблице; удалённые строки оценку завышают.
+def estimated_count(queryset):
+    return queryset.aggregate(last=Max('pk'))['last'] or 0
+
+
+class CachedCountPaginator(Paginator):
+    # COUNT(*) по большим выборкам считается один раз на count_key
+    # и версию модели, а не на каждый просмотр страницы; с estimate
+    # вместо точного количества берётся estimated_count().
+    def __init__(self, object_list, per_page, count_key=None,
+                 estimate=False, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.estimate = estimate
+
+    def compute_count(self):
+        if self.estimate:
+            return estimated_count(self.object_list)
+        return super().count
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self.compute_count()
+        key = 'paginator-count:{}:{}'.format(
+            count_version(self.object_list.model),
+            md5(self.count_key.encode()).hexdigest()
+        )
+        count = cache.get(key)
+        if count is None:
+            count = self.compute_count()
+            cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+    def get_page_window(self, number):
+        return list(self.get_elided_page_range(
+            number,
+            on_each_side=settings.PAGINATOR_ON_EACH_SIDE,
+            on_ends=settings.PAGINATOR_ON_ENDS,
+        ))
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import Resolver404, resolve
+
+REPLICA = 'replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_configured():
+    return REPLICA in connections.databases
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+# Копирует default в файл реплики через backup API SQLite;
+# заменяет репликацию при локальной разработке и в тестах.
+# Вызывается вне транзакции: иначе backup ждёт её завершения.
+def sync_replica():
+    source = connections[DEFAULT_DB_ALIAS]
+    target = connections[REPLICA]
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (_replica_reads.get() and replica_configured()
+                and model._meta.app_label in settings.REPLICA_APP_LABELS):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    # схема реплики приходит вместе с данными из default
+    def allow_migrate(self, db, app_label, **hints):
+        return db != REPLICA
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def reads_from_replica(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if settings.PRIMARY_PIN_COOKIE in request.COOKIES:
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.view_name in settings.REPLICA_URL_NAMES
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+        if self.reads_from_replica(request):
+            with replica_reads():
+                return self.get_response(request)
+        response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                settings.PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=settings.PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,82 @@
+import re
+from functools import reduce
+from operator import and_
+
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_post_fts'
+# заголовок весит больше текста при ранжировании
+RANK_SQL = f'bm25({FTS_TABLE}, 10.0, 1.0)'
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query or '')
+
+
+def match_expression(terms):
+    # каждое слово в кавычках, чтобы ввод пользователя не разбирался
+    # как синтаксис FTS5; звёздочка включает поиск по началу слова
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+# результат проверки по псевдониму базы: FTS5 может быть не собран
+# в SQLite, поэтому модуль пробуем один раз временной таблицей
+_fts5_support = {}
+
+
+def fts5_supported(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE temp.blog_fts5_probe USING fts5(x)'
+            )
+            cursor.execute('DROP TABLE temp.blog_fts5_probe')
+    except DatabaseError:
+        return False
+    return True
+
+
+def fts_available(queryset):
+    alias = queryset.db
+    if alias not in _fts5_support:
+        _fts5_support[alias] = fts5_supported(connections[alias])
+    return _fts5_support[alias]
+
+
+def like_filter(queryset, terms):
+    return queryset.filter(reduce(and_, (
+        Q(title__icontains=term) | Q(text__icontains=term) for term in terms
+    )))
+
+
+def filter_posts(queryset, query):
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if not fts_available(queryset):
+        return like_filter(queryset, terms)
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match_expression(terms),)
+    ))
+
+
+def rank_posts(queryset, query):
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if not fts_available(queryset):
+        return like_filter(queryset, terms).order_by('-pub_date', '-id')
+    # bm25() считается только внутри запроса с MATCH; LIMIT -1 не даёт
+    # SQLite подставить rowid поста в этот запрос, и ранги всех
+    # найденных постов вычисляются один раз, а не на каждую строку
+    return filter_posts(queryset, query).annotate(rank=RawSQL(
+        f'SELECT score FROM (SELECT rowid, {RANK_SQL} AS score '
+        f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT -1) ranked '
+        'WHERE ranked.rowid = blog_post.id',
+        (match_expression(terms),)
+    )).order_by('rank', '-pub_date')
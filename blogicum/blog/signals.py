@@ -0,0 +1,201 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import feed, images, page_cache, pagination, sqlite, tasks, utils
+from .models import (Category, Comments, FeedEntry, Location, Post,
+                     ceil_publication_time)
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Comments)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comments)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Post)
+def sync_feed_entry(sender, instance, raw=False, **kwargs):
+    if not raw:
+        feed.sync_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def schedule_feed_refresh(sender, instance, raw=False, **kwargs):
+    if (not raw and instance.is_published
+            and instance.pub_date > Post.published.now()):
+        tasks.schedule_feed_refresh(ceil_publication_time(instance.pub_date))
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and images.variants_are_stale(instance):
+        tasks.schedule_image_variants(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_image_variants(sender, instance, **kwargs):
+    images.remove_image_variants(instance.image_variants)
+
+
+@receiver(post_save, sender=Category)
+def sync_category_feed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        feed.refresh_feed(Post.objects.filter(category=instance))
+
+
+@receiver(post_delete, sender=Category)
+def drop_uncategorized_feed_entries(sender, instance, **kwargs):
+    FeedEntry.objects.filter(post__category__isnull=True).delete()
+
+
+def touch_posts(posts):
+    posts.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Comments)
+def touch_commented_post(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        touch_posts(Post.objects.filter(pk=instance.post_id))
+
+
+# при удалении категории или местоположения у постов обнуляется
+# внешний ключ без сигналов, поэтому версия карточек меняется заранее
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_posts(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_posts(Post.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def touch_location_posts(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_posts(Post.objects.filter(location=instance))
+
+
+@receiver(post_save, sender=User)
+def touch_author_posts(sender, instance, raw=False, update_fields=None,
+                       **kwargs):
+    if raw or (update_fields is not None and 'username' not in update_fields):
+        return
+    touch_posts(Post.objects.filter(author=instance))
+
+
+# при переносе поста в другую категорию или к другому автору
+# сбрасываются и страницы прежних категории и автора
+@receiver(pre_save, sender=Post)
+def remember_post_pages(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk is not None:
+        instance._previous_page_paths = page_cache.post_page_paths(
+            Post.objects.filter(pk=instance.pk)
+        )
+
+
+@receiver(post_save, sender=Post)
+def purge_saved_post_pages(sender, instance, raw=False, **kwargs):
+    if not raw:
+        page_cache.purge_post_pages(
+            Post.objects.filter(pk=instance.pk),
+            *getattr(instance, '_previous_page_paths', ())
+        )
+
+
+@receiver(pre_delete, sender=Post)
+def purge_deleted_post_pages(sender, instance, **kwargs):
+    page_cache.purge_post(instance.pk)
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def purge_commented_post_pages(sender, instance, raw=False, **kwargs):
+    if not raw:
+        page_cache.purge_post(instance.post_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def purge_category_pages(sender, instance, raw=False, **kwargs):
+    if not raw:
+        page_cache.purge_post_pages(
+            Post.objects.filter(category=instance),
+            page_cache.page_path('blog:category_posts', instance.slug)
+        )
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def purge_location_pages(sender, instance, raw=False, **kwargs):
+    if not raw:
+        page_cache.purge_post_pages(Post.objects.filter(location=instance))
+
+
+@receiver(post_save, sender=User)
+def purge_author_pages(sender, instance, raw=False, update_fields=None,
+                       **kwargs):
+    if raw or (update_fields is not None and 'username' not in update_fields):
+        return
+    page_cache.purge_post_pages(
+        Post.objects.filter(author=instance),
+        page_cache.page_path('blog:profile', instance.username)
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+def bump_content_version(sender, raw=False, update_fields=None, **kwargs):
+    # вход пользователя меняет только last_login
+    if raw or (update_fields is not None
+               and set(update_fields) <= {'last_login'}):
+        return
+    utils.bump_content_version()
+
+
+# видимость категории меняет и количество опубликованных постов
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_post_counts(sender, raw=False, **kwargs):
+    if not raw:
+        pagination.reset_counts(Post)
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def reset_comment_counts(sender, raw=False, **kwargs):
+    if not raw:
+        pagination.reset_counts(Comments)
+
+
+# соединение из пула (blogicum.sqlite_pool) уже настроено
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and not getattr(
+        connection, 'from_pool', False
+    ):
+        sqlite.apply_pragmas(connection)
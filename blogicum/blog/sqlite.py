@@ -0,0 +1,23 @@
+import re
+
+from django.conf import settings
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+
+def apply_pragmas(connection, pragmas=None):
+    pragmas = settings.SQLITE_PRAGMAS if pragmas is None else pragmas
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if not PRAGMA_NAME.match(name):
+                raise ValueError(f'Недопустимое имя PRAGMA: {name}')
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def read_pragmas(connection, names):
+    with connection.cursor() as cursor:
+        values = {}
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
@@ -0,0 +1,40 @@
+from . import feed, images, page_cache, pagination
+from .jobs import enqueue, task
+from .models import Post
+from .utils import actual_comment_count, bump_content_version
+
+
+@task('build_image_variants')
+def build_image_variants(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None and images.variants_are_stale(post):
+        images.build_image_variants(post)
+
+
+@task('refresh_feed')
+def refresh_feed():
+    feed.refresh_feed()
+    page_cache.purge_recently_published()
+    pagination.reset_counts(Post)
+    bump_content_version()
+    schedule_feed_refresh()
+
+
+@task('recount_comments')
+def recount_comments():
+    Post.objects.update(comment_count=actual_comment_count())
+    bump_content_version()
+
+
+def schedule_image_variants(post):
+    enqueue(
+        'build_image_variants',
+        key=f'image-variants:{post.pk}',
+        post_id=post.pk
+    )
+
+
+def schedule_feed_refresh(run_at=None):
+    run_at = run_at or Post.published.next_publication()
+    if run_at is not None:
+        enqueue('refresh_feed', key='refresh-feed', run_at=run_at)
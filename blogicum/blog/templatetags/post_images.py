@@ -0,0 +1,36 @@
+from django import template
+from django.core.files.storage import default_storage
+
+register = template.Library()
+
+IMAGE_SIZES = '(max-width: 640px) 100vw, 640px'
+
+
+def srcset(variants, key):
+    seen = {}
+    for variant in variants:
+        seen.setdefault(variant['width'], default_storage.url(variant[key]))
+    return ', '.join(f'{url} {width}w' for width, url in seen.items())
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, variant_name='card', lazy=True, css_class=''):
+    context = {
+        'post': post,
+        'css_class': css_class,
+        'loading': 'lazy' if lazy else 'eager',
+        'sizes': IMAGE_SIZES,
+    }
+    variants = dict(post.image_variants)
+    context['original'] = variants.pop('original', None)
+    variant = variants.get(variant_name)
+    if variant is None:
+        return context
+    sized = list(variants.values())
+    context.update(
+        variant=variant,
+        src=default_storage.url(variant['jpeg']),
+        webp_srcset=srcset(sized, 'webp'),
+        jpeg_srcset=srcset(sized, 'jpeg'),
+    )
+    return context
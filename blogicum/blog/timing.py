@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+# верхние границы корзин гистограммы общего времени, мс
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+METRICS = ('queries', 'db_ms', 'template_ms', 'total_ms')
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class TimingHistogram:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, metrics):
+        with self._lock:
+            stats = self._views.setdefault(view_name, {
+                'requests': 0,
+                'max_total_ms': 0.0,
+                'buckets': [0] * (len(BUCKETS_MS) + 1),
+                **{name: 0 for name in METRICS},
+            })
+            stats['requests'] += 1
+            for name in METRICS:
+                stats[name] += metrics[name]
+            stats['max_total_ms'] = max(
+                stats['max_total_ms'], metrics['total_ms']
+            )
+            stats['buckets'][bisect_left(BUCKETS_MS, metrics['total_ms'])] += 1
+
+    def snapshot(self):
+        labels = [f'<={bound}' for bound in BUCKETS_MS] + [
+            f'>{BUCKETS_MS[-1]}'
+        ]
+        with self._lock:
+            views = {name: dict(stats) for name, stats in self._views.items()}
+        for stats in views.values():
+            requests = stats['requests']
+            stats['buckets'] = dict(zip(labels, stats['buckets']))
+            for name in METRICS:
+                stats[f'avg_{name}'] = round(stats.pop(name) / requests, 2)
+        return views
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+histogram = TimingHistogram()
+
+
+def view_name_for(request):
+    match = request.resolver_match
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return '<unresolved>'
+    return match.view_name
+
+
+def budget_for(view_name):
+    budgets = settings.REQUEST_BUDGETS
+    return {**budgets.get('default', {}), **budgets.get(view_name, {})}
+
+
+# время — в миллисекундах с одним знаком, количество запросов — целым
+def format_metric(name, value):
+    return f'{value:.1f}' if name.endswith('_ms') else str(value)
+
+
+def server_timing(metrics):
+    return ', '.join((
+        f'db;dur={metrics["db_ms"]:.1f};desc="{metrics["queries"]} queries"',
+        f'tpl;dur={metrics["template_ms"]:.1f}',
+        f'total;dur={metrics["total_ms"]:.1f}',
+    ))
+
+
+class RequestTimingMiddleware:
+    # Время шаблонов — это время отрисовки TemplateResponse за вычетом
+    # запросов, выполненных во время отрисовки (ленивые QuerySet).
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def process_template_response(self, request, response):
+        timer = request._query_timer
+        request._template_started = (time.perf_counter(), timer.duration)
+        return response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._query_timer = timer
+        request._template_started = None
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        end = time.perf_counter()
+
+        template_ms = 0.0
+        if request._template_started is not None:
+            started, db_before = request._template_started
+            template_ms = (
+                end - started - (timer.duration - db_before)
+            ) * 1000
+        metrics = {
+            'queries': timer.count,
+            'db_ms': timer.duration * 1000,
+            'template_ms': template_ms,
+            'total_ms': (end - start) * 1000,
+        }
+        response['Server-Timing'] = server_timing(metrics)
+
+        view_name = view_name_for(request)
+        histogram.record(view_name, metrics)
+        exceeded = [
+            f'{name}={format_metric(name, metrics[name])} > {limit}'
+            for name, limit in budget_for(view_name).items()
+            if metrics[name] > limit
+        ]
+        if exceeded:
+            logger.warning(
+                '%s %s (%s) превысил бюджет: %s',
+                request.method, request.path, view_name, ', '.join(exceeded)
+            )
+        return response
@@ -7,6 +7,12 @@ app_name = 'blog'
 urlpatterns = [
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
     path('', views.PostsListView.as_view(), name='index'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path(
+        'timings/',
+        views.RequestTimingsView.as_view(),
+        name='request_timings'
+    ),
     path(
         'profile/<str:username>/',
         views.UserDetailView.as_view(),
@@ -37,6 +43,11 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments'
+    ),
     path(
         'posts/<int:post_id>/edit_comment/<int:comment_id>/',
         views.CommentUpdateView.as_view(),
@@ -1,5 +1,41 @@
-from django.db.models import Count
+import time
 
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
-def annotate_comments_queryset(querryset):
-    return querryset.annotate(comment_count=Count('comments'))
+from .models import Comments
+
+CONTENT_VERSION_KEY = 'content-version'
+
+
+def actual_comment_count():
+    return Coalesce(
+        Subquery(
+            Comments.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    )
+
+
+# Версия лежит в общем для всех процессов кэше (см. settings_production),
+# поэтому одинаковое содержимое получает одинаковый ETag в любом процессе.
+def content_version():
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+# Меняет версию, из которой строятся ETag списков публикаций;
+# вызывается при любом изменении постов, комментариев, категорий,
+# местоположений и авторов, в том числе через update(); сбрасывается
+# после фиксации транзакции, как и версии страниц в page_cache.
+def bump_content_version():
+    transaction.on_commit(lambda: cache.delete(CONTENT_VERSION_KEY))
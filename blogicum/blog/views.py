@@ -1,46 +1,62 @@
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
-from django.http import Http404
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django.utils import timezone
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
-
-from blogicum.settings import MAX_POSTS_IN_PROFILE_ON_PAGE
+                                  UpdateView, View)
 
+from . import search
+from .feed import visible_posts
 from .forms import CommentsForm, PostForm
-from .mixins import OnlyAuthorMixin, UserMixin
-from .models import Category, Comments, Post
-from .utils import annotate_comments_queryset
+from .mixins import (CachedObjectMixin, ConditionalGetMixin,
+                     CursorPaginationMixin, OnlyAuthorMixin, UserMixin)
+from .models import Category, Comments, FeedEntry, Post
+from .pagination import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .timing import histogram
+from .utils import content_version
 
 
-class UserDetailView(UserMixin, DetailView):
+class UserDetailView(ConditionalGetMixin, CursorPaginationMixin,
+                     CachedObjectMixin, UserMixin, DetailView):
     template_name = 'blog/profile.html'
     context_object_name = 'profile'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    def get_posts(self):
         profile_user = self.get_object()
-
         if self.request.user == profile_user:
-            user_posts = Post.objects.filter(author=profile_user)
-        else:
-            user_posts = Post.published.filter(
-                author=profile_user,
-                category__is_published=True,
-            )
+            return Post.objects.filter(author=profile_user)
+        return Post.published.filter(
+            author=profile_user,
+            category__is_published=True,
+        )
 
-        user_posts = annotate_comments_queryset(
-            user_posts
-        ).order_by('-pub_date')
+    def get_etag_parts(self):
+        profile_user = self.get_object()
+        return (
+            profile_user.username,
+            profile_user.get_full_name(),
+            profile_user.is_staff,
+            content_version(),
+            Post.published.now(),
+        )
 
-        paginator = Paginator(user_posts, MAX_POSTS_IN_PROFILE_ON_PAGE)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator, page_obj, _, _ = self.paginate_queryset(
+            self.get_posts().select_related(
+                'author',
+                'category',
+                'location'
+            ).defer('text'),
+            settings.MAX_POSTS_IN_PROFILE_ON_PAGE
+        )
 
+        context['paginator'] = paginator
         context['page_obj'] = page_obj
-        context['profile'] = profile_user
+        context['profile'] = self.object
 
         return context
 
@@ -72,95 +88,178 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostsListView(ListView):
+class PostsListView(ConditionalGetMixin, CursorPaginationMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
-    queryset = Post.published.all().prefetch_related(
-        'category',
-        'location'
-    ).select_related('author').filter(category__is_published=True)
-    ordering = '-pub_date'
+    queryset = FeedEntry.objects.all()
+    context_object_name = 'post_list'
+    cursor_ordering = ('-pub_date', '-post_id')
+    paginate_by = 10
+
+    # отложенные публикации появляются на границах Post.published.now()
+    def get_etag_parts(self):
+        return (content_version(), Post.published.now())
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, _, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        posts = Post.objects.select_related(
+            'author',
+            'category',
+            'location'
+        ).defer('text').in_bulk([entry.post_id for entry in page])
+        page.object_list = [
+            posts[entry.post_id] for entry in page if entry.post_id in posts
+        ]
+        return paginator, page, page.object_list, is_paginated
+
+
+class SearchView(ListView):
+    template_name = 'blog/search.html'
     paginate_by = 10
+    paginator_class = CachedCountPaginator
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset,
+            per_page,
+            count_key='search:' + self.request.GET.get('q', ''),
+            **kwargs
+        )
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        queryset = annotate_comments_queryset(queryset)
-        return queryset
+        return search.rank_posts(
+            visible_posts().select_related(
+                'author',
+                'category',
+                'location'
+            ).defer('text'),
+            self.request.GET.get('q')
+        )
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        if context['is_paginated']:
+            context['page_window'] = context['paginator'].get_page_window(
+                context['page_obj'].number
+            )
+        return context
 
-class PostDetailView(DetailView):
+
+class PostDetailView(ConditionalGetMixin, CachedObjectMixin, DetailView):
     model = Post
-    form_class = PostForm
     template_name = 'blog/detail.html'
+    pk_url_kwarg = 'post_id'
+    comments_cursor_param = 'comments_after'
+    etag_includes_csrf = True
 
-    def get_object(self):
-        post_id = self.kwargs.get("post_id")
-        post = get_object_or_404(Post, id=post_id)
-        if (
-            ((post.pub_date > timezone.now()
-              ) or (not post.is_published
-                    ) or not post.category.is_published)
-            and self.request.user != post.author
-        ):
-            raise Http404()
+    # updated_at поста меняется и при изменении его комментариев
+    def get_etag_parts(self):
+        return (self.get_object().updated_at,)
+
+    def get_last_modified(self):
+        return self.get_object().updated_at
+
+    def get_queryset(self):
+        visible = Q(
+            is_published=True,
+            pub_date__lte=Post.published.now(),
+            category__is_published=True,
+        )
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return Post.objects.select_related(
+            'author',
+            'category',
+            'location'
+        ).filter(visible)
 
-        return post
+    def get_comments_page(self):
+        paginator = CursorPaginator(
+            self.object.comments_set.select_related('author'),
+            settings.COMMENTS_ON_PAGE,
+            ordering=('created_at', 'id'),
+        )
+        try:
+            return paginator.get_page(
+                after=self.request.GET.get(self.comments_cursor_param)
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор комментариев.')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
         context['form'] = CommentsForm()
-        context['comments'] = post.comments_set.all().order_by('created_at')
+        context['comments'] = self.get_comments_page()
         return context
 
 
-class CategoryListView(ListView):
+class PostCommentsView(PostDetailView):
+    template_name = 'includes/comment_list.html'
+    comments_cursor_param = 'after'
+
+    def get_context_data(self, **kwargs):
+        return {
+            'post': self.object,
+            'comments': self.get_comments_page(),
+        }
+
+
+class CategoryListView(ConditionalGetMixin, CursorPaginationMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
     paginate_by = 10
 
-    def get_queryset(self):
-        category_slug = self.kwargs.get('category_slug')
-        category = get_object_or_404(Category, slug=category_slug)
-        if not category.is_published:
-            raise Http404()
+    def get_category(self):
+        if not hasattr(self, '_category'):
+            self._category = get_object_or_404(
+                Category,
+                slug=self.kwargs.get('category_slug'),
+                is_published=True
+            )
+        return self._category
+
+    def get_posts(self):
+        return Post.published.filter(category=self.get_category())
+
+    def get_etag_parts(self):
+        category = self.get_category()
+        return (
+            category.title,
+            category.description,
+            content_version(),
+            Post.published.now(),
+        )
 
-        queryset = Post.published.filter(category=category)
-        queryset = queryset.prefetch_related(
+    def get_queryset(self):
+        return self.get_posts().select_related(
+            'author',
             'category',
             'location'
-        ).select_related('author')
-        queryset = annotate_comments_queryset(queryset).order_by('-pub_date')
-        return queryset
+        ).defer('text')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        category_slug = self.kwargs.get('category_slug')
-        category = get_object_or_404(Category, slug=category_slug)
-        context['category'] = category
+        context['category'] = self.get_category()
         return context
 
 
 class PostDeleteView(OnlyAuthorMixin, DeleteView):
-    model = Post
+    queryset = Post.objects.select_related('author')
     template_name = 'blog/create.html'
-
-    def get_object(self, queryset=None):
-        post_id = self.kwargs.get('post_id')
-        return get_object_or_404(Post, id=post_id)
+    pk_url_kwarg = 'post_id'
 
     def get_success_url(self):
         return reverse('blog:index')
 
 
 class PostUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
-    model = Post
+    queryset = Post.objects.select_related('author')
     template_name = 'blog/create.html'
     form_class = PostForm
-
-    def get_object(self):
-        post_id = self.kwargs.get("post_id")
-        return get_object_or_404(Post, id=post_id)
+    pk_url_kwarg = 'post_id'
 
     def form_valid(self, form):
         post = form.save(commit=False)
@@ -181,50 +280,61 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     template_name = 'blog/comment.html'
     form_class = CommentsForm
 
+    # Транзакция начинается с записи: SQLite сразу берёт блокировку
+    # на запись и ждёт её busy_timeout. При чтении до записи повышение
+    # блокировки не ждёт и сразу даёт «database is locked». Кэши
+    # сигналы сбрасывают после фиксации, поэтому комментарий к
+    # несуществующему посту откатывается без побочных действий.
+    @transaction.atomic
     def form_valid(self, form):
-        post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        form.instance.post = post
+        form.instance.post_id = self.kwargs['post_id']
         form.instance.author = self.request.user
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if not Post.objects.filter(pk=form.instance.post_id).exists():
+            raise Http404('Публикация не найдена.')
+        return response
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': self.object.post.id}
+            kwargs={'post_id': self.object.post_id}
         )
 
 
 class CommentUpdateView(OnlyAuthorMixin, UpdateView):
-    model = Comments
+    queryset = Comments.objects.select_related('author')
     template_name = 'blog/comment.html'
     fields = ['text']
-
-    def get_object(self, queryset=None):
-        comment_id = self.kwargs.get('comment_id')
-        return get_object_or_404(Comments, id=comment_id)
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['comment'] = self.get_object()
-        return context
+    pk_url_kwarg = 'comment_id'
+    context_object_name = 'comment'
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': self.object.post.id}
+            kwargs={'post_id': self.object.post_id}
         )
 
 
 class CommentDeleteView(OnlyAuthorMixin, DeleteView):
-    model = Comments
+    queryset = Comments.objects.select_related('author')
     template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
+    context_object_name = 'comment'
 
-    def get_object(self, queryset=None):
-        comment_id = self.kwargs.get('comment_id')
-        return get_object_or_404(Comments, id=comment_id)
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        return super().delete(request, *args, **kwargs)
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': self.object.post.id}
+            kwargs={'post_id': self.object.post_id}
         )
+
+
+class RequestTimingsView(UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        return JsonResponse(histogram.snapshot())
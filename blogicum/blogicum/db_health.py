@@ -0,0 +1,9 @@
+from django.db import connections
+
+
+# Постоянные соединения проверяются в начале запроса: соединение,
+# которое перестало отвечать, закрывается, и Django откроет новое.
+def check_connections(**kwargs):
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,12 +31,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.timing.RequestTimingMiddleware',
+    'blog.page_cache.AnonymousPageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.routers.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -68,8 +72,69 @@ DATABASES = {
     }
 }
 
+# реплика только для чтения: путь к её файлу SQLite задаётся переменной
+# окружения; без неё все запросы идут в default
+if os.environ.get('BLOGICUM_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['BLOGICUM_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+# страницы, которые при GET читают из реплики, и приложения,
+# чьи модели туда направляются (сессии всегда читаются из default)
+REPLICA_URL_NAMES = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+)
+REPLICA_APP_LABELS = ('blog', 'auth')
+# после POST посетитель столько секунд читает из default,
+# чтобы увидеть свои изменения до того, как они дойдут до реплики
+PRIMARY_PIN_COOKIE = 'read_primary'
+PRIMARY_PIN_SECONDS = 15
+
+# проверять постоянные соединения (CONN_MAX_AGE) в начале каждого
+# запроса (см. settings_production)
+CONN_HEALTH_CHECKS = False
+
+# PRAGMA, выполняемые для каждого нового соединения с SQLite:
+# WAL позволяет читать во время записи, busy_timeout (мс) заставляет
+# ждать блокировку вместо ошибки «database is locked»
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # отрицательное значение — размер в килобайтах
+    'cache_size': -20000,
+    'temp_store': 'memory',
+}
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+# разбирать все шаблоны при старте процесса (см. settings_production)
+TEMPLATES_WARM_UP = False
+
+# заранее отрисованные статические страницы и страницы ошибок
+# (команда prerender_pages)
+PRERENDERED_PAGES_DIR = BASE_DIR / 'prerendered'
+
+# Кеш (в том числе фрагментов шаблонов, например карточек постов)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
 FIXTURE_DIRS = ['fixtures']
 
 # Password validation
@@ -125,6 +190,58 @@ FIXTURE_DIRS = ['fixtures']
 
 MAX_POSTS_IN_PROFILE_ON_PAGE = 10
 
+# число комментариев на странице поста и в каждой догружаемой порции
+COMMENTS_ON_PAGE = 50
+
+# число слов в анонсе поста в ленте
+POST_EXCERPT_WORDS = 10
+
+# ширины (в пикселях) уменьшенных копий фото постов, создаваемых при загрузке
+POST_IMAGE_VARIANTS = {
+    'card': 640,
+    'detail': 960,
+    'retina': 1920,
+}
+
+POST_IMAGE_QUALITY = 80
+
+# сколько секунд хранить количество объектов в постраничных списках
+# и сколько номеров страниц показывать вокруг текущей и по краям
+PAGINATOR_COUNT_TIMEOUT = 600
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+
+# бюджеты запросов: при превышении в журнал пишется предупреждение;
+# ключи — имена маршрутов, default действует для всех
+REQUEST_BUDGETS = {
+    'default': {'queries': 20, 'total_ms': 500},
+    'blog:post_detail': {'queries': 6},
+    'blog:index': {'queries': 6},
+}
+
+# полностраничный кэш для анонимных посетителей
+PAGE_CACHE_TIMEOUT = 600
+PAGE_CACHE_URL_NAMES = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'pages:about',
+    'pages:rules',
+)
+
+# очередь фоновых задач (выполняется командой run_worker)
+JOBS_MAX_ATTEMPTS = 5
+# пауза перед повтором упавшей задачи, удваивается с каждой попыткой
+JOBS_RETRY_DELAY = 30
+# сколько секунд задача считается занятой воркером; после этого
+# срока её может забрать другой воркер
+JOBS_LEASE = 300
+
+# шаг (в секундах), до которого округляется время при отборе
+# опубликованных постов: отложенные публикации появляются на границах шага
+PUBLISH_GRANULARITY = 60
+
 
 # адрес перенаправления после логина
 LOGIN_REDIRECT_URL = 'blog:index'
@@ -0,0 +1,57 @@
+import os
+
+from .settings import *  # noqa: F401, F403
+from .settings import (ALLOWED_HOSTS, BASE_DIR, CACHES, DATABASES, SECRET_KEY,
+                       TEMPLATES)
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)
+
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', ','.join(ALLOWED_HOSTS)
+).split(',')
+
+# шаблоны читаются и разбираются один раз на процесс
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'debug': False,
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# компилировать шаблоны из TEMPLATES_DIR при старте WSGI/ASGI-процесса
+TEMPLATES_WARM_UP = True
+
+# соединения с базой переживают запрос и проверяются перед повторным
+# использованием; движок с пулом умеет проверять и соединения SQLite
+DATABASES = {
+    alias: {
+        **database,
+        'ENGINE': 'blogicum.sqlite_pool',
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+    }
+    for alias, database in DATABASES.items()
+}
+CONN_HEALTH_CHECKS = True
+
+# Кэш общий для всех процессов: веб-процессов, run_worker и refresh_feed
+# из cron. Иначе сбросы страниц, версий и количеств из одного процесса
+# не видны остальным.
+CACHES = {
+    'default': {
+        **CACHES['default'],
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / 'cache'),
+    }
+}
@@ -0,0 +1,16 @@
+import os
+
+from .settings_production import *  # noqa: F401, F403
+from .settings_production import DATABASES
+
+# Под ASGI синхронный код запросов выполняется в потоках исполнителя,
+# и постоянное соединение осталось бы в каждом из них. Вместо этого
+# соединение закрывается после запроса и возвращается в пул.
+DATABASES = {
+    alias: {
+        **database,
+        'CONN_MAX_AGE': 0,
+        'POOL_SIZE': int(os.environ.get('DJANGO_DB_POOL_SIZE', 8)),
+    }
+    for alias, database in DATABASES.items()
+}
@@ -0,0 +1,89 @@
+import threading
+from queue import Empty, Full, LifoQueue
+
+from django.db.backends.sqlite3 import base
+from django.utils.asyncio import async_unsafe
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def is_alive(connection):
+    try:
+        connection.execute('SELECT 1')
+    except base.Database.Error:
+        return False
+    return True
+
+
+class ConnectionPool:
+    def __init__(self, size):
+        # LifoQueue потокобезопасна; последним вернули — первым и выдадим,
+        # так лишние соединения простаивают и не держат страницы в кэше
+        self.connections = LifoQueue(maxsize=size)
+
+    def get(self):
+        while True:
+            try:
+                connection = self.connections.get_nowait()
+            except Empty:
+                return None
+            if is_alive(connection):
+                return connection
+            connection.close()
+
+    def put(self, connection):
+        if not is_alive(connection):
+            return
+        if connection.in_transaction:
+            connection.rollback()
+        try:
+            self.connections.put_nowait(connection)
+        except Full:
+            connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self.connections.get_nowait().close()
+            except Empty:
+                return
+
+
+def get_pool(settings_dict):
+    name = str(settings_dict['NAME'])
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ConnectionPool(settings_dict['POOL_SIZE'])
+        return _pools[name]
+
+
+# SQLite с пулом соединений: закрытое Django соединение sqlite3
+# возвращается в пул и достаётся следующему запросу из любого потока
+# без переподключения. is_usable действительно проверяет соединение.
+class DatabaseWrapper(base.DatabaseWrapper):
+    # соединение взято из пула и уже настроено при первом открытии
+    from_pool = False
+
+    @property
+    def pool(self):
+        if self.settings_dict.get('POOL_SIZE') and not self.is_in_memory_db():
+            return get_pool(self.settings_dict)
+        return None
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        connection = pool and pool.get()
+        self.from_pool = connection is not None
+        return connection or super().get_new_connection(conn_params)
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.put(self.connection)
+
+    def is_usable(self):
+        return is_alive(self.connection)
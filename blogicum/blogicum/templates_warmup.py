@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.template import engines
+
+
+def project_template_names():
+    templates_dir = settings.TEMPLATES_DIR
+    for path in sorted(templates_dir.rglob('*')):
+        if path.is_file():
+            yield path.relative_to(templates_dir).as_posix()
+
+
+# С кэширующим загрузчиком разобранные шаблоны остаются в памяти
+# процесса, поэтому первые запросы не тратят время на их разбор.
+def warm_up_templates(engine=None):
+    engine = engine or engines['django'].engine
+    names = list(project_template_names())
+    for name in names:
+        engine.get_template(name)
+    return names
@@ -1,7 +1,19 @@
 import os
 
+from django.conf import settings
+from django.core.signals import request_started
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+if settings.TEMPLATES_WARM_UP:
+    from .templates_warmup import warm_up_templates
+
+    warm_up_templates()
+
+if settings.CONN_HEALTH_CHECKS:
+    from .db_health import check_connections
+
+    request_started.connect(check_connections)
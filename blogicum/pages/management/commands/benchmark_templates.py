@@ -0,0 +1,73 @@
+from time import perf_counter
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import Engine, RequestContext, engines
+from django.test import RequestFactory
+
+from blogicum.templates_warmup import warm_up_templates
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+PAGES = ('pages/about.html', 'pages/rules.html', 'pages/403csrf.html')
+
+
+def make_engine(cached):
+    base = engines['django'].engine
+    return Engine(
+        dirs=base.dirs,
+        loaders=(
+            [('django.template.loaders.cached.Loader', LOADERS)]
+            if cached else LOADERS
+        ),
+        context_processors=base.context_processors,
+        libraries=base.libraries,
+    )
+
+
+def render_pages(engine, request):
+    for name in PAGES:
+        engine.get_template(name).render(RequestContext(request))
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время отрисовки страниц с обычным и кэширующим '
+        'загрузчиком шаблонов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Сколько раз отрисовать каждую страницу.'
+        )
+
+    def measure(self, engine, request, iterations):
+        start = perf_counter()
+        for _ in range(iterations):
+            render_pages(engine, request)
+        return (perf_counter() - start) / iterations / len(PAGES) * 1000
+
+    def handle(self, *args, iterations=200, **options):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+
+        plain = make_engine(cached=False)
+        cached = make_engine(cached=True)
+        start = perf_counter()
+        warmed = warm_up_templates(cached)
+        warm_up = (perf_counter() - start) * 1000
+
+        plain_ms = self.measure(plain, request, iterations)
+        cached_ms = self.measure(cached, request, iterations)
+        self.stdout.write(
+            f'Прогрев: {len(warmed)} шаблонов за {warm_up:.1f} мс.\n'
+            f'Без кэша: {plain_ms:.3f} мс на страницу.\n'
+            f'С кэшем: {cached_ms:.3f} мс на страницу.\n'
+            f'Чтение и разбор шаблонов: {plain_ms - cached_ms:.3f} мс '
+            'на страницу.'
+        )
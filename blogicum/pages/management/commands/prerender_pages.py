@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from pages.prerender import prerender_pages
+
+
+class Command(BaseCommand):
+    help = (
+        'Отрисовывает страницы «О проекте», «Правила» и страницы ошибок '
+        'для анонимного посетителя и сохраняет их в PRERENDERED_PAGES_DIR. '
+        'Запускается при сборке, после изменения шаблонов.'
+    )
+
+    def handle(self, *args, **options):
+        for template_name in prerender_pages():
+            self.stdout.write(f'Сохранено: {template_name}')
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.urls import resolve, reverse
+from django.utils.html import escape
+
+# шаблон -> адрес, с которого страница открывается (None для ошибок)
+PAGES = {
+    'pages/about.html': 'pages:about',
+    'pages/rules.html': 'pages:rules',
+    'pages/403csrf.html': None,
+    'pages/404.html': None,
+    'pages/500.html': None,
+}
+
+# страница 404 выводит запрошенный адрес: при отрисовке на его месте
+# остаётся метка, которая заменяется при ответе
+REQUEST_URI_PLACEHOLDER = '__PRERENDERED_REQUEST_URI__'
+
+
+def prerendered_path(template_name):
+    return Path(settings.PRERENDERED_PAGES_DIR) / template_name
+
+
+def render_anonymous(template_name, url_name=None):
+    path = reverse(url_name) if url_name else '/'
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.META = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'SERVER_NAME': settings.ALLOWED_HOSTS[0],
+        'SERVER_PORT': '80',
+    }
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path) if url_name else None
+    request.build_absolute_uri = lambda location=None: (
+        REQUEST_URI_PLACEHOLDER
+    )
+    return render_to_string(template_name, request=request)
+
+
+def prerender_pages():
+    for template_name, url_name in PAGES.items():
+        path = prerendered_path(template_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            render_anonymous(template_name, url_name), encoding='utf-8'
+        )
+    return list(PAGES)
+
+
+def is_anonymous(request):
+    # проверяем только cookie, чтобы не обращаться к сессии и базе
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def serve_prerendered(request, template_name, status=HTTPStatus.OK,
+                      anonymous_only=True):
+    if not anonymous_only or is_anonymous(request):
+        try:
+            content = prerendered_path(template_name).read_bytes()
+        except OSError:
+            pass
+        else:
+            placeholder = REQUEST_URI_PLACEHOLDER.encode()
+            if placeholder in content:
+                content = content.replace(
+                    placeholder,
+                    escape(request.build_absolute_uri()).encode()
+                )
+            return HttpResponse(content, status=status)
+    return render(request, template_name, status=status)
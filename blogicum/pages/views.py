@@ -1,36 +1,59 @@
 from http import HTTPStatus
 
-from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from .prerender import is_anonymous, serve_prerendered
 
-class AboutTemplateView(TemplateView):
+
+class PrerenderedTemplateView(TemplateView):
+    def get(self, request, *args, **kwargs):
+        if is_anonymous(request):
+            return serve_prerendered(request, self.template_name)
+        return super().get(request, *args, **kwargs)
+
+
+class AboutTemplateView(PrerenderedTemplateView):
     template_name = 'pages/about.html'
 
 
-class RulesTemplateView(TemplateView):
+class RulesTemplateView(PrerenderedTemplateView):
     template_name = 'pages/rules.html'
 
 
 # ERROR 403
 def custom_403_view(request, exception=None):
-    return render(request, 'pages/403csrf.html', status=HTTPStatus.FORBIDDEN)
+    return serve_prerendered(
+        request,
+        'pages/403csrf.html',
+        status=HTTPStatus.FORBIDDEN
+    )
 
 
 # ERROR CSRF
 def csrf_failure(request, reason=''):
-    return render(request, 'pages/403csrf.html', status=HTTPStatus.FORBIDDEN)
+    return serve_prerendered(
+        request,
+        'pages/403csrf.html',
+        status=HTTPStatus.FORBIDDEN
+    )
 
 
 # ERROR 404
 def page_not_found(request, exception):
-    return render(request, 'pages/404.html', status=HTTPStatus.NOT_FOUND)
+    return serve_prerendered(
+        request,
+        'pages/404.html',
+        status=HTTPStatus.NOT_FOUND
+    )
 
 
 # ERROR 500
+# Отдаёт готовый файл всем посетителям: при сбое не трогаем ни шаблоны,
+# ни базу данных.
 def internal_server_error(request):
-    return render(
+    return serve_prerendered(
         request,
         'pages/500.html',
-        status=HTTPStatus.INTERNAL_SERVER_ERROR
+        status=HTTPStatus.INTERNAL_SERVER_ERROR,
+        anonymous_only=False
     )
@@ -10,6 +10,8 @@ from typing import (Any, Iterable, List, NamedTuple, Optional, Tuple, Type,
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Field, Model
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -32,6 +34,25 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def run_on_commit_immediately(request, monkeypatch):
+    # тест без transaction=True целиком идёт в транзакции, которая не
+    # фиксируется, поэтому действия после фиксации выполняются сразу
+    marker = request.node.get_closest_marker('django_db')
+    if 'transactional_db' in request.fixturenames or (
+        marker is not None and marker.kwargs.get('transaction')
+    ):
+        return
+    monkeypatch.setattr(
+        transaction, 'on_commit', lambda func, using=None: func()
+    )
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -354,6 +375,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_posts(mixer: Mixer, published_locations, published_category):
+    authors = mixer.cycle(10).blend(get_user_model())
+    posts = mixer.cycle(40).blend(
+        'blog.Post',
+        author=mixer.sequence(*authors),
+        category=published_category,
+        location=mixer.sequence(*published_locations),
+    )
+    mixer.cycle(40).blend(
+        'blog.Comments',
+        post=mixer.sequence(*posts),
+        author=mixer.sequence(*authors),
+    )
+    return posts
+
+
+@pytest.mark.parametrize('url', ['/admin/blog/post/', '/admin/blog/comments/'])
+def test_changelist_query_count(
+    admin_client, many_posts, url, django_assert_max_num_queries
+):
+    # сессия, пользователь, количество и сама страница
+    with django_assert_max_num_queries(4):
+        response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    with django_assert_max_num_queries(3):
+        admin_client.get(url + '?p=1')
+
+
+def test_author_filter_lists_no_users(admin_client, many_posts):
+    author = many_posts[0].author
+    response = admin_client.get('/admin/blog/post/')
+    content = response.content.decode('utf-8')
+    assert 'name="author"' in content
+    assert f'?author={author.pk}' not in content, (
+        'Убедитесь, что фильтр по автору не выводит всех пользователей.'
+    )
+    response = admin_client.get(
+        '/admin/blog/post/', {'author': author.username}
+    )
+    assert set(response.context['cl'].result_list) == set(
+        author.post.all()
+    )
+
+
+def test_comment_search_by_related_fields(admin_client, many_posts):
+    post = many_posts[0]
+    response = admin_client.get(
+        '/admin/blog/comments/', {'q': post.author.username}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['cl'].result_count > 0
+
+
+def test_filtered_comment_count_follows_changes(
+    admin_client, mixer: Mixer, many_posts
+):
+    author = many_posts[0].author
+    url = f'/admin/blog/comments/?q={author.username}'
+    count = admin_client.get(url).context['cl'].paginator.count
+    comment = mixer.blend('blog.Comments', post=many_posts[0], author=author)
+    assert admin_client.get(url).context['cl'].paginator.count == (
+        count + 1
+    ), (
+        'Убедитесь, что сохранённое количество комментариев сбрасывается '
+        'при их добавлении.'
+    )
+    comment.delete()
+    assert admin_client.get(url).context['cl'].paginator.count == count
+
+
+def test_unfiltered_count_is_estimated(admin_client, many_posts):
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get('/admin/blog/post/')
+    assert response.context['cl'].paginator.count == max(
+        post.pk for post in many_posts
+    )
+    assert not any('COUNT(' in q['sql'] for q in ctx.captured_queries), (
+        'Убедитесь, что без фильтров количество публикаций оценивается, '
+        'а не считается через COUNT(*).'
+    )
+
+
+def test_comment_keeps_post_count(
+    admin_client, mixer: Mixer, many_posts, django_assert_max_num_queries
+):
+    url = '/admin/blog/post/?is_published__exact=1'
+    admin_client.get(url)
+    mixer.blend('blog.Comments', post=many_posts[0])
+    # сессия, пользователь и сама страница
+    with django_assert_max_num_queries(3):
+        admin_client.get(url)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import FeedEntry, Job, Post
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 45
+
+
+@pytest.fixture
+def category_posts(mixer: Mixer, user, published_category):
+    return mixer.cycle(N_POSTS).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+def test_category_page_shows_one_page_of_posts(
+    admin_client, published_category, category_posts,
+    django_assert_max_num_queries
+):
+    url = f'/admin/blog/category/{published_category.id}/change/'
+    # сессия, пользователь, категория, количество и страница публикаций,
+    # а также служебные запросы админки (точка сохранения, ContentType)
+    with django_assert_max_num_queries(8):
+        response = admin_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    page = response.context['related_posts']
+    assert len(page) == 20
+    assert page.paginator.count == N_POSTS
+    assert 'name="post-0-title"' not in response.content.decode('utf-8'), (
+        'Убедитесь, что публикации категории не выводятся формами.'
+    )
+    response = admin_client.get(url, {'posts_page': 3})
+    assert len(response.context['related_posts']) == N_POSTS - 40
+
+
+def test_location_page_has_panel(admin_client, published_location):
+    response = admin_client.get(
+        f'/admin/blog/location/{published_location.id}/change/'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert 'related-posts' in response.content.decode('utf-8')
+
+
+def test_bulk_unpublish_updates_feed(
+    admin_client, published_category, category_posts
+):
+    selected = category_posts[:3]
+    before = {post.pk: post.updated_at for post in selected}
+    next_url = f'/admin/blog/category/{published_category.id}/change/'
+    response = admin_client.post('/admin/blog/post/', {
+        'action': 'unpublish_posts',
+        'index': 0,
+        '_selected_action': [post.pk for post in selected],
+        'next': next_url,
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    assert response['Location'] == next_url
+    for post in Post.objects.filter(pk__in=before):
+        assert not post.is_published
+        assert post.updated_at > before[post.pk]
+    assert not FeedEntry.objects.filter(post__in=selected).exists(), (
+        'Убедитесь, что массовое снятие с публикации обновляет ленту.'
+    )
+
+    admin_client.post('/admin/blog/post/', {
+        'action': 'publish_posts',
+        'index': 0,
+        '_selected_action': [post.pk for post in selected],
+    })
+    assert FeedEntry.objects.filter(post__in=selected).count() == 3
+
+
+def test_bulk_publish_schedules_future_posts(
+    admin_client, mixer: Mixer, user, published_category
+):
+    pub_date = timezone.now() + timedelta(hours=1)
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False, pub_date=pub_date,
+    )
+    admin_client.post('/admin/blog/post/', {
+        'action': 'publish_posts',
+        'index': 0,
+        '_selected_action': [post.pk],
+    })
+    job = Job.objects.get(key='refresh-feed')
+    assert job.run_after >= pub_date, (
+        'Убедитесь, что массовая публикация планирует добавление '
+        'отложенных публикаций в ленту.'
+    )
+
+
+@pytest.mark.parametrize('object_id', ['999', 'abc'])
+def test_missing_category_redirects(admin_client, object_id):
+    response = admin_client.get(f'/admin/blog/category/{object_id}/change/')
+    assert response.status_code == HTTPStatus.FOUND
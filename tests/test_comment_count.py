@@ -0,0 +1,75 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog import page_cache, pagination, utils
+from blog.models import Comments, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+    mixer: Mixer, user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.comment_count == 0
+
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Первый'})
+    mixer.blend('blog.Comments', post=post, author=user)
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что счётчик комментариев увеличивается при их создании.'
+    )
+
+    comment = post.comments_set.filter(text='Первый').get()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что счётчик комментариев уменьшается при их удалении.'
+    )
+
+
+def test_recount_comments_command(
+    mixer: Mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comments', post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=42)
+
+    with pytest.raises(CommandError):
+        call_command('recount_comments', check=True)
+    call_command('recount_comments')
+    call_command('recount_comments', check=True)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+def test_feed_has_no_comment_aggregate(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get('/')
+    sql = ' '.join(query['sql'].upper() for query in ctx.captured_queries)
+    assert 'GROUP BY' not in sql
+
+
+def test_comment_on_missing_post_is_rejected(user_client):
+    response = user_client.post('/posts/999/comment/', {'text': 'Текст'})
+    assert response.status_code == 404
+    assert not Comments.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rejected_comment_has_no_side_effects(user_client):
+    versions = (
+        page_cache.path_version('/'), utils.content_version(),
+        pagination.count_version(Post), pagination.count_version(Comments),
+    )
+    response = user_client.post('/posts/999/comment/', {'text': 'Текст'})
+    assert response.status_code == 404
+    assert (
+        page_cache.path_version('/'), utils.content_version(),
+        pagination.count_version(Post), pagination.count_version(Comments),
+    ) == versions, (
+        'Убедитесь, что отклонённый комментарий не сбрасывает кэши.'
+    )
@@ -0,0 +1,62 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+PAGE_SIZE = 3
+N_COMMENTS = 7
+
+
+@pytest.fixture
+def long_thread(mixer: Mixer, settings, user, post_with_published_location):
+    settings.COMMENTS_ON_PAGE = PAGE_SIZE
+    comments = mixer.cycle(N_COMMENTS).blend(
+        'blog.Comments', post=post_with_published_location, author=user
+    )
+    return post_with_published_location, comments
+
+
+def comment_ids(html):
+    return [int(i) for i in re.findall(r'name="comment_(\d+)"', html)]
+
+
+def test_comment_thread_is_paginated(
+    client, long_thread, django_assert_max_num_queries
+):
+    post, comments = long_thread
+    expected = [comment.id for comment in sorted(
+        comments, key=lambda c: (c.created_at, c.id)
+    )]
+
+    response = client.get(f'/posts/{post.id}/')
+    html = response.content.decode('utf-8')
+    seen = comment_ids(html)
+    assert seen == expected[:PAGE_SIZE], (
+        'Убедитесь, что на странице поста выводится только первая порция'
+        ' комментариев.'
+    )
+
+    while len(seen) < N_COMMENTS:
+        more_url = re.search(r'data-comments-more="([^"]+)"', html).group(1)
+        with django_assert_max_num_queries(2):
+            response = client.get(more_url.replace('&amp;', '&'))
+        assert response.status_code == HTTPStatus.OK
+        html = response.content.decode('utf-8')
+        assert '<html' not in html, (
+            'Убедитесь, что догружаемые комментарии отдаются фрагментом.'
+        )
+        seen += comment_ids(html)
+
+    assert seen == expected
+    assert 'data-comments-more' not in html
+
+
+def test_comments_fragment_respects_visibility(another_user_client, long_thread):
+    post, _ = long_thread
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.test import Client
+from mixer.backend.django import Mixer
+
+from blog import utils
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def urls(user, post_with_published_location):
+    post = post_with_published_location
+    return {
+        'index': '/',
+        'category': f'/category/{post.category.slug}/',
+        'profile': f'/profile/{user.username}/',
+        'detail': f'/posts/{post.id}/',
+    }
+
+
+# сессия и пользователь; версия списков хранится в кэше, поэтому
+# в базу идут ещё только категория, автор или сама публикация
+@pytest.mark.parametrize(
+    'page, queries',
+    [('index', 2), ('category', 3), ('profile', 3), ('detail', 3)]
+)
+def test_unchanged_page_is_not_modified(
+    user_client, urls, page, queries, django_assert_num_queries
+):
+    response = user_client.get(urls[page])
+    etag = response['ETag']
+    with django_assert_num_queries(queries):
+        response = user_client.get(urls[page], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что неизменившаяся страница отдаётся с кодом 304.'
+    )
+    assert not response.content
+
+
+@pytest.mark.parametrize('page', ['index', 'category', 'profile', 'detail'])
+def test_comment_changes_etag(
+    mixer: Mixer, client, urls, page, post_with_published_location
+):
+    etag = client.get(urls[page])['ETag']
+    mixer.blend('blog.Comments', post=post_with_published_location)
+    response = client.get(urls[page], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+def test_etag_depends_on_user(client, user_client, urls):
+    assert client.get('/')['ETag'] != user_client.get('/')['ETag']
+
+
+def test_hidden_post_is_not_revalidated(
+    client, urls, post_with_published_location
+):
+    etag = client.get(urls['detail'])['ETag']
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    response = client.get(urls['detail'], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_etag_changes_after_login(user, urls):
+    client = Client()
+    client.force_login(user)
+    etag = client.get(urls['detail'])['ETag']
+    client.logout()
+    client.force_login(user)
+    response = client.get(urls['detail'], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что после нового входа страница с формой '
+        'не отдаётся из кэша браузера со старым CSRF-токеном.'
+    )
+
+
+def test_content_version_is_shared_in_production(settings, tmp_path):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path),
+    }}
+
+    def other_process(code):
+        return subprocess.run(
+            [sys.executable, '-c', (
+                'import django, sys; from django.conf import settings; '
+                "settings.DATABASES['default']['NAME'] = sys.argv[1]; "
+                'django.setup(); from blog import utils; ' + code
+            ), str(tmp_path / 'db.sqlite3')],
+            cwd=Path(utils.__file__).resolve().parent.parent,
+            env={
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': 'blogicum.settings_production',
+                'DJANGO_CACHE_DIR': str(tmp_path),
+            },
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+    version = utils.content_version()
+    assert other_process('print(utils.content_version())') == str(version), (
+        'Убедитесь, что ETag списков совпадают во всех процессах.'
+    )
+    other_process('utils.bump_content_version()')
+    assert utils.content_version() != version
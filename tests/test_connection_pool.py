@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+
+import pytest
+from django.db import connections
+
+from blogicum.db_health import check_connections
+from blogicum.sqlite_pool.base import ConnectionPool, get_pool
+
+pytestmark = [pytest.mark.django_db]
+
+POOLED = 'pooled'
+
+
+@pytest.fixture
+def pooled(tmp_path):
+    connections.databases[POOLED] = {
+        'ENGINE': 'blogicum.sqlite_pool',
+        'NAME': str(tmp_path / 'pooled.sqlite3'),
+        'POOL_SIZE': 2,
+    }
+    yield connections[POOLED]
+    connections[POOLED].close()
+    get_pool(connections.databases[POOLED]).close()
+    del connections[POOLED]
+    del connections.databases[POOLED]
+
+
+def test_closed_connection_is_reused(pooled):
+    pooled.ensure_connection()
+    raw = pooled.connection
+    pooled.close()
+    pooled.ensure_connection()
+    assert pooled.connection is raw, (
+        'Убедитесь, что закрытое соединение возвращается в пул.'
+    )
+    assert pooled.from_pool
+
+
+def test_pool_discards_dead_connections(tmp_path):
+    pool = ConnectionPool(2)
+    dead = sqlite3.connect(str(tmp_path / 'db.sqlite3'))
+    pool.put(dead)
+    dead.close()
+    assert pool.get() is None
+
+
+def test_pool_rolls_back_and_limits_size(tmp_path):
+    pool = ConnectionPool(1)
+    first = sqlite3.connect(str(tmp_path / 'db.sqlite3'))
+    first.execute('CREATE TABLE t (x)')
+    first.execute('BEGIN')
+    first.execute('INSERT INTO t VALUES (1)')
+    pool.put(first)
+    assert not first.in_transaction
+    second = sqlite3.connect(str(tmp_path / 'db.sqlite3'))
+    pool.put(second)
+    with pytest.raises(sqlite3.ProgrammingError):
+        second.execute('SELECT 1')
+    assert pool.get() is first
+
+
+def test_pool_is_thread_safe(tmp_path):
+    pool = ConnectionPool(4)
+    in_use = set()
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            connection = pool.get() or sqlite3.connect(
+                str(tmp_path / 'db.sqlite3'), check_same_thread=False
+            )
+            with lock:
+                if id(connection) in in_use:
+                    errors.append(connection)
+                in_use.add(id(connection))
+            with lock:
+                in_use.discard(id(connection))
+            pool.put(connection)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, 'Одно соединение выдано двум потокам сразу.'
+    assert pool.connections.qsize() <= 4
+    pool.close()
+
+
+def test_health_check_closes_broken_connection(pooled):
+    pooled.ensure_connection()
+    pooled.connection.close()
+    check_connections()
+    assert pooled.connection is None
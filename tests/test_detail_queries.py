@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def commented_post(mixer: Mixer, post_with_published_location):
+    authors = mixer.cycle(3).blend('auth.User')
+    mixer.cycle(6).blend(
+        'blog.Comments',
+        post=post_with_published_location,
+        author=mixer.sequence(*authors),
+    )
+    return post_with_published_location
+
+
+def test_detail_is_two_queries(
+    client, commented_post, django_assert_num_queries
+):
+    with django_assert_num_queries(2):
+        response = client.get(f'/posts/{commented_post.id}/')
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context['comments']) == 6
+
+
+def test_detail_for_author_adds_only_auth_queries(
+    user_client, commented_post, django_assert_num_queries
+):
+    commented_post.is_published = False
+    commented_post.save()
+    # сессия и пользователь + пост и комментарии
+    with django_assert_num_queries(4):
+        response = user_client.get(f'/posts/{commented_post.id}/')
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_hidden_post_is_404_for_others(
+    another_user_client, commented_post
+):
+    commented_post.is_published = False
+    commented_post.save()
+    response = another_user_client.get(f'/posts/{commented_post.id}/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,54 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(30))
+
+
+def test_excerpt_filled_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    assert post.excerpt == ' '.join(LONG_TEXT.split()[:10]) + ' …'
+
+
+def test_excerpt_length_follows_settings(
+    settings, post_with_published_location
+):
+    settings.POST_EXCERPT_WORDS = 3
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    assert post.excerpt == 'слово0 слово1 слово2 …'
+
+
+def test_backfill_excerpts(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(text=LONG_TEXT, excerpt='')
+    call_command('backfill_excerpts')
+    post.refresh_from_db()
+    assert post.excerpt.startswith('слово0 слово1')
+
+
+@pytest.mark.parametrize('url_name', ['index', 'category', 'profile'])
+def test_listings_skip_post_text(
+    client, user, post_with_published_location, url_name
+):
+    post = post_with_published_location
+    url = {
+        'index': '/',
+        'category': f'/category/{post.category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }[url_name]
+    with CaptureQueriesContext(connection) as ctx:
+        content = client.get(url).content.decode('utf-8')
+    assert post.excerpt in content
+    assert not any(
+        '"blog_post"."text"' in query['sql']
+        for query in ctx.captured_queries
+    ), 'Убедитесь, что ленты не загружают полный текст публикаций.'
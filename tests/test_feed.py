@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+# авторизованный пользователь видит саму ленту, а не полностраничный кэш
+def feed_ids(client):
+    return [post.id for post in client.get('/').context['page_obj']]
+
+
+def test_feed_follows_post_and_category(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert FeedEntry.objects.filter(post=post).exists()
+    assert feed_ids(user_client) == [post.id]
+
+    post.is_published = False
+    post.save()
+    assert feed_ids(user_client) == [], (
+        'Убедитесь, что снятая с публикации запись пропадает из ленты.'
+    )
+
+    post.is_published = True
+    post.save()
+    post.category.is_published = False
+    post.category.save()
+    assert feed_ids(user_client) == [], (
+        'Убедитесь, что записи скрытой категории пропадают из ленты.'
+    )
+
+    post.category.is_published = True
+    post.category.save()
+    assert feed_ids(user_client) == [post.id]
+
+
+def test_refresh_feed_promotes_scheduled_posts(
+    user_client, future_posts
+):
+    assert feed_ids(user_client) == []
+    due = future_posts[0]
+    Post.objects.filter(pk=due.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=5)
+    )
+    assert feed_ids(user_client) == []
+
+    call_command('refresh_feed')
+    assert feed_ids(user_client) == [due.id], (
+        'Убедитесь, что периодическая синхронизация добавляет в ленту'
+        ' наступившие отложенные публикации.'
+    )
+
+
+def test_feed_query_skips_visibility_joins(
+    client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get('/')
+    feed_queries = [
+        query['sql'] for query in ctx.captured_queries
+        if 'blog_feedentry' in query['sql']
+    ]
+    # ETag строится из версии в кэше, в базу идёт только сама страница
+    assert len(feed_queries) == 1
+    assert not any('blog_category' in sql for sql in feed_queries)
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def large_image_post(mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new('RGB', (2400, 1200), color=(73, 109, 137)).save(img_io, 'JPEG')
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        image=ImageFile(img_io, name='large.jpg'),
+    )
+    call_command('run_worker', once=True)
+    post.refresh_from_db()
+    return post
+
+
+def test_variants_built_on_upload(large_image_post):
+    variants = large_image_post.image_variants
+    assert variants['original'] == {
+        'name': large_image_post.image.name, 'width': 2400, 'height': 1200,
+    }
+    assert variants['card']['width'] == 640
+    assert variants['card']['height'] == 320
+    for name in ('card', 'detail', 'retina'):
+        for fmt in ('webp', 'jpeg'):
+            assert default_storage.exists(variants[name][fmt])
+
+
+def test_card_uses_responsive_image(client, large_image_post):
+    soup = BeautifulSoup(client.get('/').content, features='html.parser')
+    img = soup.find('img', srcset=True)
+    assert img is not None, (
+        'Убедитесь, что карточка поста выводит уменьшенные копии фото.'
+    )
+    assert img['loading'] == 'lazy'
+    assert (img['width'], img['height']) == ('640', '320')
+    assert '1920w' in img['srcset']
+    assert soup.find('source', type='image/webp') is not None
+
+
+def test_backfill_command(large_image_post):
+    Post.objects.filter(pk=large_image_post.pk).update(image_variants={})
+    call_command('build_image_variants')
+    large_image_post.refresh_from_db()
+    assert large_image_post.image_variants['detail']['width'] == 960
+
+
+def test_variant_sizes_follow_settings(settings, mixer, user,
+                                       published_category):
+    settings.POST_IMAGE_VARIANTS = {'card': 320}
+    img_io = BytesIO()
+    Image.new('RGB', (1000, 500)).save(img_io, 'JPEG')
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=ImageFile(img_io, name='small.jpg'),
+    )
+    call_command('run_worker', once=True)
+    post.refresh_from_db()
+    assert set(post.image_variants) == {'original', 'card'}
+    assert post.image_variants['card']['width'] == 320
@@ -0,0 +1,58 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+LISTING_TABLES = ('blog_feedentry', 'blog_post', 'blog_comments')
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def main_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    for query in ctx.captured_queries:
+        table = re.search(r'FROM "(\w+)"', query['sql'])
+        if table and table.group(1) in LISTING_TABLES:
+            yield table.group(1), query['sql']
+
+
+def assert_indexed(client, url):
+    checked = 0
+    for table, sql in main_queries(client, url):
+        plan = explain(sql)
+        for step in plan:
+            assert not re.fullmatch(rf'SCAN (TABLE )?{table}', step), (
+                f'Запрос страницы {url} сканирует всю таблицу {table}:'
+                f' {plan}'
+            )
+            assert 'TEMP B-TREE' not in step, (
+                f'Запрос страницы {url} сортирует {table} без индекса:'
+                f' {plan}'
+            )
+        checked += 1
+    assert checked, f'Не найдено запросов к публикациям на странице {url}.'
+
+
+@pytest.fixture
+def listing_urls(user, published_category, post_with_published_location,
+                 comment_to_a_post):
+    return [
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+        f'/posts/{post_with_published_location.id}/',
+    ]
+
+
+def test_listings_use_indexes(client, user_client, listing_urls):
+    for url in listing_urls:
+        assert_indexed(client, url)
+        assert_indexed(user_client, url)
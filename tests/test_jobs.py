@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import jobs
+from blog.models import FeedEntry, Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def flaky_task(monkeypatch):
+    calls = []
+
+    def flaky(fail=0):
+        calls.append(fail)
+        if len(calls) <= fail:
+            raise RuntimeError('сбой')
+
+    monkeypatch.setitem(jobs.TASKS, 'flaky', flaky)
+    return calls
+
+
+def test_enqueue_is_idempotent_by_key(flaky_task):
+    later = timezone.now() + timedelta(hours=1)
+    jobs.enqueue('flaky', key='same', run_at=later)
+    jobs.enqueue('flaky', key='same')
+    jobs.enqueue('flaky', key='same', run_at=later)
+    assert Job.objects.count() == 1
+    assert jobs.run_pending() == 1
+    assert flaky_task == [0], (
+        'Убедитесь, что задача с одним ключом выполняется один раз.'
+    )
+    assert not Job.objects.exists()
+
+
+def test_failed_job_is_retried(settings, flaky_task):
+    settings.JOBS_RETRY_DELAY = 0
+    jobs.enqueue('flaky', fail=1)
+    jobs.run_pending(limit=1)
+    job = Job.objects.get()
+    assert job.status == Job.PENDING
+    assert 'RuntimeError' in job.last_error
+    jobs.run_pending()
+    assert flaky_task == [1, 1]
+    assert not Job.objects.exists()
+
+
+def test_job_fails_after_max_attempts(settings, flaky_task):
+    settings.JOBS_RETRY_DELAY = 0
+    settings.JOBS_MAX_ATTEMPTS = 2
+    jobs.enqueue('flaky', fail=5)
+    jobs.run_pending()
+    job = Job.objects.get()
+    assert job.status == Job.FAILED
+    assert job.attempts == 2
+
+
+def test_unknown_task_is_rejected():
+    with pytest.raises(ValueError):
+        jobs.enqueue('missing')
+
+
+def test_scheduled_post_enters_feed_via_worker(
+    monkeypatch, mixer, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1),
+    )
+    job = Job.objects.get(key='refresh-feed')
+    assert job.run_after >= post.pub_date
+    call_command('run_worker', once=True)
+    assert not FeedEntry.objects.filter(post=post).exists()
+
+    later = job.run_after + timedelta(seconds=1)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    call_command('run_worker', once=True)
+    assert FeedEntry.objects.filter(post=post).exists(), (
+        'Убедитесь, что воркер добавляет наступившую отложенную '
+        'публикацию в ленту.'
+    )
+    assert not Job.objects.filter(key='refresh-feed').exists()
+
+
+def test_crashed_job_is_not_retried_forever(settings, flaky_task):
+    settings.JOBS_MAX_ATTEMPTS = 2
+    past = timezone.now() - timedelta(seconds=1)
+    job = Job.objects.create(
+        name='flaky', key='crashed', status=Job.RUNNING,
+        attempts=2, run_after=past
+    )
+    assert jobs.run_pending() == 0
+    job.refresh_from_db()
+    assert job.status == Job.FAILED, (
+        'Убедитесь, что задача с истёкшей арендой и исчерпанными '
+        'попытками помечается как упавшая.'
+    )
+    assert flaky_task == []
@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def table_queries(client, url, table, method='get'):
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, method)(url)
+    selects = [
+        query['sql'] for query in ctx.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    ]
+    return response, selects
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        'blog.Comments', post=post_with_published_location, author=user
+    )
+
+
+@pytest.mark.parametrize('action', ['edit_comment', 'delete_comment'])
+def test_comment_views_load_comment_once(user_client, own_comment, action):
+    url = f'/posts/{own_comment.post_id}/{action}/{own_comment.id}/'
+    response, selects = table_queries(user_client, url, 'blog_comments')
+    assert response.status_code == HTTPStatus.OK
+    assert len(selects) == 1, (
+        'Убедитесь, что комментарий загружается один раз за запрос.'
+    )
+    assert 'auth_user' in selects[0]
+
+
+@pytest.mark.parametrize('action', ['edit', 'delete'])
+def test_post_views_load_post_once(
+    user_client, post_with_published_location, action
+):
+    url = f'/posts/{post_with_published_location.id}/{action}/'
+    response, selects = table_queries(user_client, url, 'blog_post')
+    assert response.status_code == HTTPStatus.OK
+    assert len(selects) == 1, (
+        'Убедитесь, что публикация загружается один раз за запрос.'
+    )
+
+
+def test_non_author_is_rejected(another_user_client, own_comment):
+    url = f'/posts/{own_comment.post_id}/edit_comment/{own_comment.id}/'
+    assert another_user_client.get(url).status_code == HTTPStatus.FORBIDDEN
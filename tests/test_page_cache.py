@@ -0,0 +1,202 @@
+import os
+import subprocess
+import sys
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog import page_cache, utils
+from blog.models import floor_publication_time
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def urls(user, post_with_published_location):
+    post = post_with_published_location
+    return {
+        'index': '/',
+        'category': f'/category/{post.category.slug}/',
+        'profile': f'/profile/{user.username}/',
+        'detail': f'/posts/{post.id}/',
+        'about': '/pages/about/',
+    }
+
+
+@pytest.mark.parametrize(
+    'page', ['index', 'category', 'profile', 'detail', 'about']
+)
+def test_anonymous_pages_are_cached(
+    client, urls, page, django_assert_num_queries
+):
+    first = client.get(urls[page])
+    assert first.status_code == HTTPStatus.OK
+    with django_assert_num_queries(0):
+        second = client.get(urls[page])
+    assert second.content == first.content, (
+        'Убедитесь, что анонимные посетители получают страницу из кэша.'
+    )
+
+
+def test_session_cookie_bypasses_cache(user_client, urls):
+    user_client.get(urls['index'])
+    assert user_client.get(urls['index']).context is not None
+
+
+@pytest.mark.parametrize('page', ['index', 'category', 'profile', 'detail'])
+def test_comment_purges_post_pages(
+    mixer: Mixer, client, urls, page, post_with_published_location
+):
+    client.get(urls[page])
+    comment = mixer.blend(
+        'blog.Comments', post=post_with_published_location
+    )
+    response = client.get(urls[page])
+    assert response.context is not None, (
+        'Убедитесь, что изменение комментариев сбрасывает кэш страниц поста.'
+    )
+    client.get(urls[page])
+    comment.delete()
+    assert client.get(urls[page]).context is not None
+
+
+def test_purge_is_targeted(
+    mixer: Mixer, client, urls, another_user, published_category
+):
+    client.get(urls['detail'])
+    mixer.blend(
+        'blog.Post', author=another_user, category=published_category
+    )
+    assert client.get(urls['detail']).context is None, (
+        'Убедитесь, что новая публикация не сбрасывает кэш чужих страниц.'
+    )
+
+
+def test_query_string_is_part_of_key(client, urls):
+    client.get(urls['index'])
+    assert client.get(urls['index'] + '?after=x').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_hidden_post_is_purged(client, urls, post_with_published_location):
+    client.get(urls['detail'])
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert client.get(urls['detail']).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('page', ['category', 'profile'])
+def test_moved_post_purges_previous_pages(
+    mixer: Mixer, client, urls, page, another_user,
+    post_with_published_location
+):
+    client.get(urls[page])
+    post = post_with_published_location
+    post.category = mixer.blend('blog.Category', is_published=True)
+    post.author = another_user
+    post.save()
+    response = client.get(urls[page])
+    assert response.context is not None, (
+        'Убедитесь, что перенос публикации сбрасывает кэш страниц '
+        'прежних категории и автора.'
+    )
+    assert post not in response.context['page_obj']
+
+
+def test_cyrillic_profile_is_purged(
+    mixer: Mixer, client, published_category
+):
+    author = mixer.blend('auth.User', username='иван')
+    post = mixer.blend(
+        'blog.Post', author=author, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        title='Старый заголовок',
+    )
+    url = '/profile/иван/'
+    assert 'Старый заголовок' in client.get(url).content.decode()
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in client.get(url).content.decode(), (
+        'Убедитесь, что кэш страницы автора с именем не латиницей '
+        'сбрасывается при изменении его публикаций.'
+    )
+
+
+def test_scheduled_post_appears_without_purge(
+    mixer: Mixer, client, monkeypatch, user, published_category
+):
+    bucket = floor_publication_time(timezone.now()) + timedelta(days=1)
+
+    def at(seconds):
+        moment = bucket + timedelta(seconds=seconds)
+        monkeypatch.setattr(timezone, 'now', lambda: moment)
+
+    at(5)
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=bucket + timedelta(seconds=90),
+    )
+    url = f'/category/{published_category.slug}/'
+    client.get(url)
+    at(55)
+    assert client.get(url).context is None
+    at(125)
+    response = client.get(url)
+    assert response.context is not None, (
+        'Убедитесь, что наступившая отложенная публикация появляется '
+        'на кэшированной странице без сброса кэша.'
+    )
+    assert post in response.context['page_obj']
+
+
+def test_production_purge_reaches_other_processes(settings, tmp_path):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path),
+    }}
+    version = page_cache.path_version('/')
+    subprocess.run(
+        [sys.executable, '-c', (
+            'import django, sys; from django.conf import settings; '
+            "settings.DATABASES['default']['NAME'] = sys.argv[1]; "
+            'django.setup(); from blog import page_cache; '
+            "page_cache.purge_pages(['/'])"
+        ), str(tmp_path / 'db.sqlite3')],
+        cwd=Path(page_cache.__file__).resolve().parent.parent,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'blogicum.settings_production',
+            'DJANGO_CACHE_DIR': str(tmp_path),
+        },
+        check=True,
+    )
+    assert page_cache.path_version('/') != version, (
+        'Убедитесь, что в боевых настройках сброс кэша из одного процесса '
+        'виден остальным.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_purge_waits_for_commit(mixer: Mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    version = page_cache.path_version('/')
+    content_version = utils.content_version()
+    with transaction.atomic():
+        post.title = 'Новый заголовок'
+        post.save()
+        assert page_cache.path_version('/') == version, (
+            'Убедитесь, что кэш страниц сбрасывается только после '
+            'фиксации транзакции.'
+        )
+        assert utils.content_version() == content_version
+    assert page_cache.path_version('/') != version
+    assert utils.content_version() != content_version
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 25
+
+
+@pytest.fixture
+def paged_posts(mixer: Mixer, user, published_category, published_location):
+    now = timezone.now()
+    # пары постов с одинаковой датой проверяют разрешение ничьих по id
+    dates = (now - timedelta(hours=i // 2) for i in range(2, N_POSTS + 2))
+    return mixer.cycle(N_POSTS).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        location=published_location,
+        pub_date=dates,
+    )
+
+
+def walk_pages(client, url):
+    seen, response = [], client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    while True:
+        page = response.context['page_obj']
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            return seen, page
+        response = client.get(url, {'after': page.next_cursor})
+
+
+@pytest.mark.parametrize('url_name', ['index', 'category', 'profile'])
+def test_cursor_walks_every_post_once(
+    client, paged_posts, published_category, user, url_name
+):
+    url = {
+        'index': '/',
+        'category': f'/category/{published_category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }[url_name]
+    expected = [
+        post.id for post in
+        sorted(paged_posts, key=lambda p: (p.pub_date, p.id), reverse=True)
+    ]
+    seen, last_page = walk_pages(client, url)
+    assert seen == expected, (
+        'Убедитесь, что курсорная пагинация проходит все публикации'
+        ' ровно один раз, «от новых к старым».'
+    )
+
+    response = client.get(url, {'before': last_page.previous_cursor})
+    previous_ids = [post.id for post in response.context['page_obj']]
+    tail = len(last_page)
+    assert previous_ids == expected[-tail - 10:-tail], (
+        'Убедитесь, что ссылка «назад» возвращает предыдущую страницу.'
+    )
+
+
+def test_cursor_page_has_no_count_or_offset(client, paged_posts):
+    first = client.get('/').context['page_obj']
+    with CaptureQueriesContext(connection) as ctx:
+        client.get('/', {'after': first.next_cursor})
+    sql = ' '.join(query['sql'].upper() for query in ctx.captured_queries)
+    assert 'OFFSET' not in sql
+    assert 'COUNT(*)' not in sql
+
+
+def test_invalid_cursor_is_404(client, paged_posts):
+    response = client.get('/', {'after': 'not-a-cursor'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
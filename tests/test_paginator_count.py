@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from bs4 import BeautifulSoup
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.pagination import CachedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 120
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    return mixer.cycle(N_POSTS).blend(
+        'blog.Post', author=user, category=published_category,
+        title='Путешествие', is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    return response, [
+        q['sql'] for q in ctx.captured_queries if 'COUNT(' in q['sql']
+    ]
+
+
+def test_count_is_cached_between_pages(user_client, many_posts):
+    _, counts = count_queries(user_client, '/search/?q=путешествие')
+    assert len(counts) == 1
+    _, counts = count_queries(user_client, '/search/?q=путешествие&page=5')
+    assert not counts, (
+        'Убедитесь, что количество результатов не пересчитывается'
+        ' на каждой странице.'
+    )
+
+
+def test_count_refreshed_on_unpublish(user_client, many_posts):
+    user_client.get('/search/?q=путешествие')
+    post = many_posts[0]
+    post.is_published = False
+    post.save()
+    response, counts = count_queries(user_client, '/search/?q=путешествие')
+    assert len(counts) == 1
+    assert response.context['paginator'].count == N_POSTS - 1
+
+
+def test_page_links_are_bounded(user_client, many_posts):
+    response = user_client.get('/search/?q=путешествие&page=6')
+    soup = BeautifulSoup(response.content, features='html.parser')
+    links = soup.select('.pagination .page-item')
+    # назад, 1, …, 4-8, …, 12, вперёд
+    assert len(links) == 11, (
+        'Убедитесь, что в пагинаторе выводится ограниченное окно страниц.'
+    )
+    assert soup.select_one('.page-item.active').text.strip() == '6'
+
+
+def test_paginator_without_key_counts_directly(many_posts):
+    paginator = CachedCountPaginator(Post.objects.all(), 10)
+    assert paginator.count == N_POSTS
+
+
+def test_page_window_follows_settings(settings, many_posts):
+    settings.PAGINATOR_ON_EACH_SIDE = 1
+    paginator = CachedCountPaginator(Post.objects.all(), 10)
+    assert paginator.get_page_window(6) == [
+        1, paginator.ELLIPSIS, 5, 6, 7, paginator.ELLIPSIS, 12
+    ]
@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def index_html(client):
+    return client.get('/').content.decode('utf-8')
+
+
+def test_post_card_is_cached(client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in index_html(client)
+
+    # обновление в обход save() не меняет версию поста
+    Post.objects.filter(pk=post.pk).update(title='Заголовок без версии')
+    assert post.title in index_html(client), (
+        'Убедитесь, что карточки постов в ленте берутся из кеша.'
+    )
+
+
+@pytest.mark.parametrize('change', ['post', 'category', 'location', 'author'])
+def test_post_card_invalidation(client, post_with_published_location, change):
+    post = post_with_published_location
+    index_html(client)
+
+    if change == 'post':
+        post.title = 'Новый заголовок'
+        post.save()
+        expected = post.title
+    elif change == 'category':
+        post.category.title = 'Новая категория'
+        post.category.save()
+        expected = post.category.title
+    elif change == 'location':
+        post.location.name = 'Новое место'
+        post.location.save()
+        expected = post.location.name
+    else:
+        post.author.username = 'renamed_author'
+        post.author.save()
+        expected = '@renamed_author'
+
+    assert expected in index_html(client), (
+        f'Убедитесь, что изменение ({change}) сбрасывает кеш карточки поста.'
+    )
+
+
+@pytest.mark.parametrize('related', ['category', 'location'])
+def test_post_card_invalidated_on_related_delete(
+    user_client, user, post_with_published_location, related
+):
+    post = post_with_published_location
+    name = str(getattr(post, related))
+    url = f'/profile/{user.username}/'
+    assert name in user_client.get(url).content.decode('utf-8')
+    getattr(post, related).delete()
+    assert name not in user_client.get(url).content.decode('utf-8'), (
+        f'Убедитесь, что удаление ({related}) сбрасывает кеш карточки поста.'
+    )
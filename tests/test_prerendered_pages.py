@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from pages import views
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def prerendered(settings, tmp_path):
+    settings.PRERENDERED_PAGES_DIR = tmp_path
+    call_command('prerender_pages')
+    return tmp_path
+
+
+@pytest.mark.parametrize('url', ['/pages/about/', '/pages/rules/'])
+def test_static_pages_served_without_templates(
+    client, prerendered, url, django_assert_num_queries
+):
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert not response.templates, (
+        'Убедитесь, что анонимным посетителям отдаётся заранее'
+        ' отрисованная страница.'
+    )
+    assert 'text-white' in response.content.decode('utf-8')
+
+
+def test_static_page_rendered_for_user(user_client, prerendered, user):
+    response = user_client.get('/pages/about/')
+    assert response.templates
+    assert user.username in response.content.decode('utf-8')
+
+
+def test_404_served_prerendered(client, prerendered):
+    response = client.get('/no-such-page/', {'q': '"'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert not response.templates
+    assert 'http://testserver/no-such-page/?q=%22' in (
+        response.content.decode('utf-8')
+    ), 'Убедитесь, что страница 404 выводит запрошенный адрес.'
+
+
+def test_500_skips_templates_and_db(prerendered, monkeypatch):
+    def broken_render(*args, **kwargs):
+        raise AssertionError('шаблон не должен отрисовываться')
+
+    monkeypatch.setattr('pages.prerender.render', broken_render)
+    request = RequestFactory().get('/')
+    with CaptureQueriesContext(connection) as ctx:
+        response = views.internal_server_error(request)
+    assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert not ctx.captured_queries
+
+
+def test_fallback_renders_without_prerendered(settings, client, tmp_path):
+    settings.PRERENDERED_PAGES_DIR = tmp_path / 'missing'
+    response = client.get('/pages/rules/')
+    assert response.status_code == HTTPStatus.OK
+    assert response.templates
+
+
+def test_views_do_not_import_test_machinery():
+    code = (
+        'import django, sys; django.setup(); import pages.views; '
+        'sys.exit("django.test" in sys.modules)'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=Path(views.__file__).resolve().parent.parent,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'blogicum.settings'},
+    )
+    assert result.returncode == 0, (
+        'Убедитесь, что страницы не импортируют django.test.'
+    )
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def minute_granularity(settings):
+    settings.PUBLISH_GRANULARITY = 60
+
+
+def test_published_now_is_bucketed(minute_granularity, monkeypatch):
+    def cutoff_at(moment):
+        monkeypatch.setattr(timezone, 'now', lambda: moment)
+        return Post.published.now(), str(Post.published.all().query)
+
+    bucket = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    early = cutoff_at(bucket + timedelta(seconds=5))
+    late = cutoff_at(bucket + timedelta(seconds=55))
+    assert early[0] == bucket
+    assert early == late, (
+        'Убедитесь, что срез и SQL выборки опубликованных постов не'
+        ' меняются в пределах одного интервала округления.'
+    )
+    assert cutoff_at(bucket + timedelta(seconds=60)) != late, (
+        'Убедитесь, что в следующем интервале срез публикации сдвигается.'
+    )
+
+
+def test_next_publication_is_bucket_boundary(
+    minute_granularity, mixer, user
+):
+    assert Post.published.next_publication() is None
+    pub_date = timezone.now() + timedelta(hours=1, seconds=1)
+    mixer.blend('blog.Post', author=user, pub_date=pub_date)
+    boundary = Post.published.next_publication()
+    assert boundary >= pub_date
+    assert boundary - pub_date < timedelta(seconds=60)
+    assert boundary.second == 0 and boundary.microsecond == 0
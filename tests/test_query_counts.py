@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def dataset(
+    mixer: Mixer, user, another_user, published_locations,
+    published_category, another_category
+):
+    past = (
+        timezone.now() - timedelta(hours=hours) for hours in range(1, 100)
+    )
+    categories = (published_category, another_category)
+    posts = mixer.cycle(15).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        pub_date=past,
+        category=mixer.sequence(*categories),
+        location=mixer.sequence(*published_locations),
+    )
+    mixer.cycle(5).blend(
+        'blog.Post',
+        author=another_user,
+        is_published=True,
+        pub_date=past,
+        category=published_category,
+        location=None,
+    )
+    commenters = mixer.cycle(3).blend('auth.User')
+    post = posts[-1]
+    comments = mixer.cycle(12).blend(
+        'blog.Comments', post=post, author=mixer.sequence(*commenters)
+    )
+    own_comment = mixer.blend('blog.Comments', post=post, author=user)
+    return {
+        'post': post,
+        'comment': own_comment,
+        'others_comment': comments[0],
+        'category': published_category,
+        'user': user,
+    }
+
+
+# адрес -> (аноним, автор, другой пользователь); запросы пользователя
+# включают загрузку сессии и самого пользователя
+QUERY_CEILINGS = {
+    'index': (2, 4, 4),
+    'search': (2, 4, 4),
+    'profile': (2, 4, 4),
+    'category': (2, 4, 4),
+    'detail': (2, 4, 4),
+    'comments': (2, 4, 4),
+    'create_post': (0, 4, 4),
+    'edit_post': (0, 5, 3),
+    'delete_post': (0, 3, 3),
+    'add_comment': (0, 2, 2),
+    'edit_comment': (0, 3, 3),
+    'delete_comment': (0, 3, 3),
+    'edit_profile': (0, 3, 3),
+    'timings': (0, 2, 2),
+    'about': (0, 2, 2),
+    'rules': (0, 2, 2),
+}
+CLIENTS = ('anon', 'author', 'other')
+
+
+def urls(data):
+    post = data['post']
+    return {
+        'index': '/',
+        'search': '/search/?q=' + post.title.split()[0],
+        'profile': f'/profile/{data["user"].username}/',
+        'category': f'/category/{data["category"].slug}/',
+        'detail': f'/posts/{post.id}/',
+        'comments': f'/posts/{post.id}/comments/',
+        'create_post': '/posts/create/',
+        'edit_post': f'/posts/{post.id}/edit/',
+        'delete_post': f'/posts/{post.id}/delete/',
+        'add_comment': f'/posts/{post.id}/comment/',
+        'edit_comment': (
+            f'/posts/{post.id}/edit_comment/{data["comment"].id}/'
+        ),
+        'delete_comment': (
+            f'/posts/{post.id}/delete_comment/{data["comment"].id}/'
+        ),
+        'edit_profile': f'/user/{data["user"].username}/',
+        'timings': '/timings/',
+        'about': '/pages/about/',
+        'rules': '/pages/rules/',
+    }
+
+
+def test_every_url_is_covered():
+    from blog.urls import urlpatterns as blog_urls
+    from pages.urls import urlpatterns as pages_urls
+    names = {pattern.name for pattern in blog_urls + pages_urls}
+    assert names == {
+        'index', 'search', 'request_timings', 'profile', 'edit_post',
+        'edit_profile', 'category_posts', 'add_comment', 'post_detail',
+        'post_comments', 'edit_comment', 'delete_comment', 'delete_post',
+        'create_post', 'about', 'rules',
+    }, 'Добавьте новый адрес в QUERY_CEILINGS.'
+    assert len(QUERY_CEILINGS) == len(names)
+
+
+@pytest.mark.parametrize('who', CLIENTS)
+@pytest.mark.parametrize('page', QUERY_CEILINGS)
+def test_query_count(
+    dataset, page, who, client, user_client, another_user_client,
+    django_assert_num_queries
+):
+    clients = dict(zip(CLIENTS, (client, user_client, another_user_client)))
+    expected = QUERY_CEILINGS[page][CLIENTS.index(who)]
+    with django_assert_num_queries(expected):
+        clients[who].get(urls(dataset)[page])
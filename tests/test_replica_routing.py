@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connections
+
+from blog.models import Comments, Post
+from blog.routers import REPLICA, ReplicaRouter, sync_replica
+
+# backup API не копирует базу, пока в ней открыта транзакция теста
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+# реплика — отдельный файл SQLite, который заполняется только
+# через sync_replica(), поэтому видно, из какой базы читает страница
+@pytest.fixture
+def replica(tmp_path):
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    yield
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def test_listing_reads_from_replica(replica, client, user,
+                                    post_with_published_location):
+    sync_replica()
+    post = post_with_published_location
+    new_post = Post.objects.create(
+        title='Новая', text='Текст', author=user,
+        category=post.category, pub_date=post.pub_date, is_published=True
+    )
+    assert client.get(f'/posts/{new_post.id}/').status_code == (
+        HTTPStatus.NOT_FOUND
+    ), 'Убедитесь, что страница публикации читает данные из реплики.'
+    sync_replica()
+    assert client.get(f'/posts/{new_post.id}/').status_code == HTTPStatus.OK
+
+
+def test_post_pins_reads_to_primary(replica, user_client,
+                                    post_with_published_location):
+    sync_replica()
+    url = f'/posts/{post_with_published_location.id}/'
+    response = user_client.post(f'{url}comment/', {'text': 'Свежий'})
+    assert response.status_code == HTTPStatus.FOUND
+    assert settings.PRIMARY_PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после POST посетитель читает из основной базы.'
+    )
+    assert Comments.objects.filter(text='Свежий').exists()
+    assert 'Свежий' in user_client.get(url).content.decode()
+
+    del user_client.cookies[settings.PRIMARY_PIN_COOKIE]
+    assert 'Свежий' not in user_client.get(url).content.decode()
+
+
+def test_other_pages_read_from_primary(replica, user_client, user,
+                                       post_with_published_location):
+    sync_replica()
+    post = Post.objects.create(
+        title='Новая', text='Текст', author=user,
+        category=post_with_published_location.category,
+        pub_date=post_with_published_location.pub_date
+    )
+    assert user_client.get(f'/posts/{post.id}/edit/').status_code == (
+        HTTPStatus.OK
+    )
+
+
+def test_writes_go_to_primary():
+    assert ReplicaRouter().db_for_write(Post) == 'default'
+    assert ReplicaRouter().allow_migrate(REPLICA, 'blog') is False
+
+
+def test_no_pin_cookie_without_replica(user_client,
+                                       post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/', {'text': 'Да'}
+    )
+    assert settings.PRIMARY_PIN_COOKIE not in response.cookies
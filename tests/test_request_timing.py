@@ -0,0 +1,53 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from blog.timing import histogram
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def empty_histogram():
+    histogram.reset()
+
+
+def test_server_timing_header(client, post_with_published_location):
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    header = response['Server-Timing']
+    assert 'db;dur=' in header and 'tpl;dur=' in header, (
+        'Убедитесь, что ответ содержит заголовок Server-Timing.'
+    )
+    assert 'desc="2 queries"' in header
+
+
+def test_histogram_per_url_name(client, post_with_published_location):
+    for _ in range(3):
+        client.get(f'/posts/{post_with_published_location.id}/')
+    client.get('/no-such-page/')
+    stats = histogram.snapshot()
+    detail = stats['blog:post_detail']
+    assert detail['requests'] == 3
+    assert sum(detail['buckets'].values()) == 3
+    assert detail['avg_template_ms'] > 0
+    assert '<unresolved>' in stats
+
+
+def test_budget_warning(
+    settings, caplog, client, post_with_published_location
+):
+    settings.REQUEST_BUDGETS = {'blog:post_detail': {'queries': 1}}
+    with caplog.at_level(logging.WARNING, logger='blog.timing'):
+        client.get(f'/posts/{post_with_published_location.id}/')
+    assert 'queries=2 > 1' in caplog.text, (
+        'Убедитесь, что превышение бюджета запросов попадает в журнал.'
+    )
+
+
+def test_timings_view_is_staff_only(user_client, admin_client):
+    assert user_client.get('/timings/').status_code == HTTPStatus.FORBIDDEN
+    response = admin_client.get('/timings/')
+    assert response.status_code == HTTPStatus.OK
+    # учтён только запрос пользователя, получившего отказ
+    assert response.json()['blog:request_timings']['requests'] == 1
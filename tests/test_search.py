@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import search
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+
+    def blend(**kwargs):
+        kwargs = {'is_published': True, 'pub_date': past, **kwargs}
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category, **kwargs
+        )
+
+    return {
+        'title': blend(title='Восхождение на Эльбрус', text='Горы зовут.'),
+        'text': blend(title='Отпуск', text='Поднялись на эльбрус летом.'),
+        'hidden': blend(title='Эльбрус зимой', is_published=False),
+        'future': blend(
+            title='Эльбрус весной', pub_date=timezone.now() + timedelta(1)
+        ),
+        'other': blend(title='Море', text='Пляж и солнце.'),
+    }
+
+
+def found(client, query):
+    response = client.get('/search/', {'q': query})
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_search_ranks_title_matches_first(client, searchable_posts):
+    assert found(client, 'эльбрус') == [
+        searchable_posts['title'].id, searchable_posts['text'].id
+    ], (
+        'Убедитесь, что поиск выводит только опубликованные посты и'
+        ' ставит совпадения в заголовке выше.'
+    )
+
+
+def test_search_matches_word_prefix(client, searchable_posts):
+    assert found(client, 'Поднял') == [searchable_posts['text'].id]
+
+
+def test_search_ignores_fts_syntax(client, searchable_posts):
+    assert found(client, 'эльбрус" (*^') == found(client, 'эльбрус')
+    assert found(client, '') == []
+
+
+def test_index_follows_edits(client, searchable_posts):
+    post = searchable_posts['other']
+    post.title = 'Казбек'
+    post.save()
+    assert found(client, 'казбек') == [post.id]
+    assert found(client, 'море') == []
+    post.delete()
+    assert found(client, 'казбек') == []
+
+
+def test_search_uses_fts_index(client, searchable_posts):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get('/search/', {'q': 'эльбрус'})
+    assert any('blog_post_fts' in q['sql'] for q in ctx.captured_queries)
+    assert not any('LIKE' in q['sql'] for q in ctx.captured_queries)
+
+
+def test_admin_search_uses_fts(admin_client, searchable_posts):
+    response = admin_client.get('/admin/blog/post/', {'q': 'эльбрус'})
+    result = set(response.context['cl'].result_list)
+    assert result == set(Post.objects.filter(title__contains='Эльбрус')) | {
+        searchable_posts['text']
+    }
+
+
+def test_search_falls_back_without_fts5(
+    client, searchable_posts, monkeypatch
+):
+    monkeypatch.setitem(search._fts5_support, 'default', False)
+    with CaptureQueriesContext(connection) as ctx:
+        assert set(found(client, 'льбрус')) == {
+            searchable_posts['title'].id, searchable_posts['text'].id
+        }
+    assert not any('blog_post_fts' in q['sql'] for q in ctx.captured_queries)
+
+
+def test_fts5_is_probed_once(monkeypatch):
+    monkeypatch.setattr(search, '_fts5_support', {})
+    with CaptureQueriesContext(connection) as ctx:
+        assert search.fts_available(Post.objects.all())
+        assert search.fts_available(Post.objects.all())
+    probes = [q for q in ctx.captured_queries if 'fts5(' in q['sql']]
+    assert len(probes) == 1, (
+        'Убедитесь, что поддержка FTS5 проверяется один раз'
+        ' для каждой базы.'
+    )
@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection, connections
+
+from blog.sqlite import apply_pragmas, read_pragmas
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Настройки только для SQLite.'
+    ),
+]
+
+
+# busy_timeout = 5000 и так стоит по умолчанию (timeout в Django),
+# поэтому проверяем значения, отличающиеся от умолчаний
+def test_pragmas_applied_on_connect(settings):
+    settings.SQLITE_PRAGMAS = {
+        **settings.SQLITE_PRAGMAS, 'busy_timeout': 1234
+    }
+    new_connection = connections.create_connection('default')
+    try:
+        values = read_pragmas(
+            new_connection, ['busy_timeout', 'synchronous', 'temp_store']
+        )
+    finally:
+        new_connection.close()
+    assert values == {'busy_timeout': 1234, 'synchronous': 1,
+                      'temp_store': 2}, (
+        'Убедитесь, что при подключении к SQLite выполняются SQLITE_PRAGMAS.'
+    )
+
+
+def test_apply_custom_pragmas(settings):
+    apply_pragmas(connection, {'busy_timeout': 100})
+    try:
+        assert read_pragmas(connection, ['busy_timeout']) == {
+            'busy_timeout': 100
+        }
+    finally:
+        apply_pragmas(connection, {
+            'busy_timeout': settings.SQLITE_PRAGMAS['busy_timeout']
+        })
+
+
+def test_invalid_pragma_name_rejected():
+    with pytest.raises(ValueError):
+        apply_pragmas(connection, {'busy_timeout = 0; DROP TABLE x': 1})
@@ -0,0 +1,30 @@
+from importlib import import_module
+
+from django.template import Engine, engines
+
+from blogicum.templates_warmup import project_template_names, warm_up_templates
+
+
+def test_production_uses_cached_loader():
+    production = import_module('blogicum.settings_production')
+    options = production.TEMPLATES[0]['OPTIONS']
+    assert production.DEBUG is False
+    assert options['loaders'][0][0] == (
+        'django.template.loaders.cached.Loader'
+    ), 'Убедитесь, что в боевых настройках включён кэширующий загрузчик.'
+    assert production.TEMPLATES_WARM_UP
+
+
+def test_warm_up_compiles_every_template(settings):
+    engine = Engine(
+        dirs=[settings.TEMPLATES_DIR],
+        libraries=engines['django'].engine.libraries,
+        loaders=[('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ])],
+    )
+    names = warm_up_templates(engine)
+    assert 'includes/post_card.html' in names
+    assert set(names) == set(project_template_names())
+    assert len(engine.template_loaders[0].get_template_cache) == len(names)